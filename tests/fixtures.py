@@ -1,5 +1,36 @@
+from typing import Tuple
+
 import pytest
 from wtsettings import ApiConfiguration, Database
+from wtsettings.database import User
+from wtsettings.schemas import WTSettingsYAMLSchema
+
+COLORS = (
+    "background black blue brightBlack brightBlue brightCyan brightGreen brightPurple "
+    "brightRed brightWhite brightYellow cursorColor cyan foreground green purple red "
+    "selectionBackground white yellow"
+)
+
+
+def create_store(n: int) -> WTSettingsYAMLSchema:
+    """A store with one profile, one scheme and ``n`` actions."""
+
+    return WTSettingsYAMLSchema(
+        copyFormatting="none",
+        copyOnSelect=False,
+        defaultProfile="guid-0",
+        profiles={
+            "defaults": {"guid": "defaults", "hidden": False, "name": "defaults"},
+            "list": [{"guid": "guid-0", "hidden": False, "name": "bash"}],
+        },
+        schemes=[{**dict.fromkeys(COLORS.split(), "#000000"), "name": "black"}],
+        actions={
+            "Clear": [
+                {"keys": f"alt+{k}", "command": {"action": "sendInput", "input": "clear"}}
+                for k in range(n)
+            ]
+        },
+    )
 
 
 @pytest.fixture
@@ -20,3 +51,35 @@ def database(database_):
     database_.drop_tables(unsafe=True)
     database_.create_tables()
     yield database_
+
+
+@pytest.fixture
+def users(database) -> Tuple[int, ...]:
+    """Ten users with the ids one to ten."""
+
+    idUsers = tuple(range(1, 11))
+    with database.sessionmaker() as session:
+        session.add_all(
+            User(idUsers=k, userId=f"user-{k}", userName=f"user-{k}") for k in idUsers
+        )
+        session.commit()
+
+    return idUsers
+
+
+@pytest.fixture
+def replicated_database(tmp_path):
+    """Two SQLite files, the second standing in for a replica of the first."""
+
+    configuration = ApiConfiguration.construct(
+        mysql=ApiConfiguration.MySqlConfiguration(
+            drivername="sqlite",
+            url={"database": str(tmp_path / "primary.db")},
+            replicas=[{"database": str(tmp_path / "replica.db")}],
+        ),
+    )
+    database = Database(configuration=configuration)
+    database.create_tables()
+    database.Base.metadata.create_all(database.replicas[0])
+
+    yield database
@@ -0,0 +1,129 @@
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+from wtsettings.__main__ import Config, Main, WTSettingsYAMLSchema
+from wtsettings.api import Rendered, RenderedStore, create_app
+
+STORE = """
+actions :
+  Clear :
+    - command :
+        action : "sendInput"
+        input : "clear\\r"
+      keys : "alt+x"
+  Misc :
+    - command : "paste"
+      keys : "ctrl+v"
+"""
+
+
+@pytest.fixture
+def store_path(tmp_path):
+
+    filepath = tmp_path / "settings.yaml"
+    filepath.write_text(STORE)
+    return filepath
+
+
+@pytest.fixture
+def client(store_path):
+
+    store = RenderedStore(Config(YAMLConfig=str(store_path)))
+    return TestClient(create_app(store))
+
+
+class TestApi:
+    @staticmethod
+    def test_matches_main(client, store_path):
+
+        wtsettings = WTSettingsYAMLSchema.load(Config(YAMLConfig=str(store_path)))
+
+        response = client.get("/actions")
+        assert response.status_code == 200
+        assert response.text == Main.render_all(wtsettings)
+
+        response = client.get("/actions/Clear")
+        assert response.status_code == 200
+        assert response.text == Main.render_subsection(wtsettings, "Clear")
+
+        assert client.get("/actions/Nope").status_code == 404
+        assert client.get("/profiles").status_code == 404
+
+    @staticmethod
+    def test_compressed(client):
+
+        response = client.get("/actions", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert len(response.json()) == 2
+
+        response = client.get("/actions", headers={"Accept-Encoding": "identity"})
+        assert "Content-Encoding" not in response.headers
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "accept_encoding, encoding",
+        [
+            ("gzip;q=0", None),
+            ("gzip; q=0.0, identity", None),
+            ("gzip;q=0.5", "gzip"),
+            ("*", "br"),
+            ("*, br;q=0", "gzip"),
+            ("*, br;q=0, gzip;q=0", None),
+            ("br;q=0, gzip", "gzip"),
+        ],
+    )
+    def test_quality_values(accept_encoding, encoding):
+
+        rendered = Rendered(b"{}", b"gzip", b"br")
+        assert rendered.encode(accept_encoding)[0] == encoding
+
+    @staticmethod
+    def test_etag(client, store_path):
+
+        etag = client.get("/version").headers["ETag"]
+        response = client.get("/actions", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+        # Missing resources are missing whatever the ETag.
+        response = client.get("/actions/Nope", headers={"If-None-Match": etag})
+        assert response.status_code == 404
+
+        # Changing the store changes the version.
+        store_path.write_text(STORE.replace("alt+x", "alt+shift+x"))
+        os.utime(store_path, (0, 0))
+        response = client.get("/actions", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert "alt+shift+x" in response.text
+
+    @staticmethod
+    def test_snapshot(client, store_path):
+
+        store = client.app.state.store
+        version, responses = store.refresh()
+        assert store.snapshot == (version, responses)
+
+        store_path.write_text(STORE.replace("alt+x", "alt+shift+x"))
+        os.utime(store_path, (0, 0))
+        new_version, new_responses = store.refresh()
+
+        # The previous snapshot is untouched by the rerender.
+        assert new_version != version
+        assert "alt+shift+x" in new_responses["actions"].identity.decode()
+        assert "alt+shift+x" not in responses["actions"].identity.decode()
+
+    @staticmethod
+    def test_same_size_rewrite(client, store_path):
+
+        store = client.app.state.store
+        version, _ = store.refresh()
+
+        # Same size and a modification time within a float's resolution.
+        stat = os.stat(store_path)
+        store_path.write_text(STORE.replace("alt+x", "alt+y"))
+        os.utime(store_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+        new_version, responses = store.refresh()
+        assert new_version != version
+        assert "alt+y" in responses["actions"].identity.decode()
@@ -0,0 +1,71 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from wtsettings.cache import RenderCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+
+    return RenderCache(str(tmp_path / "cache"), max_bytes=250)
+
+
+class TestRenderCache:
+    @staticmethod
+    def test_get_put(cache):
+
+        key = cache.key("digest", "subsection", "Clear", 2)
+        assert key != cache.key("digest", "subsection", "Clear", None)
+        assert cache.get(key) is None
+
+        cache.put(key, "[]")
+        assert cache.get(key) == "[]"
+        assert cache.info()["entries"] == 1
+
+    @staticmethod
+    def test_evict_least_recently_used(cache):
+
+        keys = tuple(cache.key(k) for k in range(3))
+        for k, key in enumerate(keys[:2]):
+            cache.put(key, 100 * "x")
+            os.utime(cache.filepath(key), (k, k))
+
+        # Reading the first entry makes the second the least recently used.
+        assert cache.get(keys[0]) is not None
+        cache.put(keys[2], 100 * "x")
+
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) is not None
+        assert cache.info()["entries"] == 2
+        assert cache.info()["bytes"] <= cache.max_bytes
+
+    @staticmethod
+    def test_clear(cache):
+
+        cache.put(cache.key(0), "[]")
+        assert cache.clear() == 1
+        assert cache.info()["entries"] == 0
+
+    @staticmethod
+    def test_concurrent_put(cache):
+
+        key = cache.key("digest")
+        with ThreadPoolExecutor(8) as executor:
+            tuple(executor.map(lambda k: cache.put(key, f"[{k}]"), range(64)))
+
+        assert cache.get(key) is not None
+        assert os.listdir(cache.directory) == [os.path.basename(cache.filepath(key))]
+
+    @staticmethod
+    def test_get_evicted_after_read(cache, monkeypatch):
+
+        key = cache.key("digest")
+        cache.put(key, "[]")
+
+        def utime(filepath, *args):
+            os.remove(filepath)
+            raise FileNotFoundError(filepath)
+
+        monkeypatch.setattr(os, "utime", utime)
+        assert cache.get(key) == "[]"
@@ -1,11 +1,20 @@
+import base64
+from datetime import date, datetime
+from decimal import Decimal
 from typing import Tuple
 
 import pytest
-from sqlalchemy import select
+from sqlalchemy import Column, Date, DateTime, Integer, Numeric, String, select
 from sqlalchemy.engine import Engine
 from sqlalchemy.engine.base import Connection
 from sqlalchemy.sql.expression import text
-from wtsettings.database import Database, User
+from wtsettings.database import (
+    CursorError,
+    Database,
+    Permission,
+    PermissionFlags,
+    User,
+)
 
 Base = Database.Base
 
@@ -99,3 +108,156 @@ class TestDatabase:
         # Read the users generated, make obvious assertions
         users = database.scalars(select(User))
         assert len(users) == 10
+
+    @staticmethod
+    def test_paginate(database):
+
+        with database.sessionmaker() as session:
+            ids = iter(range(1, 26))
+            create_dummy_users = User.create_create_dummies(
+                database, {"idUsers": lambda: next(ids)}
+            )
+            session.add_all(create_dummy_users(25))
+            session.commit()
+
+        # Walk every page and make sure that each user is seen exactly once and in order.
+        seen, cursor = [], None
+        while True:
+            page = database.paginate(
+                select(User), (User.idUsers,), cursor=cursor, limit=10
+            )
+            assert len(page.items) <= 10
+            seen.extend(item["idUsers"] for item in page.items)
+            if (cursor := page.cursor) is None:
+                break
+
+        assert seen == sorted(seen)
+        assert len(seen) == len(set(seen)) == 25
+
+        # An ordering of the statement is replaced by the keys.
+        page = database.paginate(
+            select(User).order_by(User.idUsers.desc()), (User.idUsers,), limit=10
+        )
+        page = database.paginate(
+            select(User).order_by(User.idUsers.desc()),
+            (User.idUsers,),
+            cursor=page.cursor,
+            limit=10,
+        )
+        assert [item["idUsers"] for item in page.items] == seen[10:20]
+
+    @staticmethod
+    def test_cursor():
+
+        keys = (
+            Column("a", Integer),
+            Column("b", Date),
+            Column("c", DateTime),
+            Column("d", Numeric),
+            Column("e", String),
+        )
+        values = (1, date(2024, 1, 2), datetime(2024, 1, 2, 3), Decimal("1.5"), "x")
+        cursor = Database.encode_cursor(values)
+        assert Database.decode_cursor(cursor, keys) == values
+        assert type(Database.decode_cursor(cursor, keys)[1]) is date
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "cursor",
+        [
+            "not base64!",
+            base64.urlsafe_b64encode(b"{").decode(),
+            base64.urlsafe_b64encode(b"5").decode(),
+            base64.urlsafe_b64encode(b"[1, 2]").decode(),
+            base64.urlsafe_b64encode(b'["x"]').decode(),
+        ],
+    )
+    def test_decode_cursor_malformed(cursor):
+
+        with pytest.raises(CursorError):
+            Database.decode_cursor(cursor, (Column("a", Numeric),))
+
+    @staticmethod
+    def test_query(database):
+
+        with database.sessionmaker() as session:
+            dummy_users = User.create_create_dummies(database)(3)
+            session.add_all(dummy_users)
+            session.commit()
+            user_ids = tuple(user.userId for user in dummy_users)
+
+        for user_id in user_ids:
+            (user,) = database.query("user_by_user_id", userId=user_id)
+            assert user.userId == user_id
+
+        # The statement is compiled once and then reused.
+        info = database.query_cache_info()
+        assert info["calls"]["user_by_user_id"] == 3
+        assert info["misses"] == 1
+        assert info["hits"] == 2
+
+    @staticmethod
+    def test_permission_grant_revoke(database, users):
+
+        counts = Permission.grant(database, 1, range(2, 8), batch_size=4)
+        assert counts.inserted == 6
+        assert counts.updated == 0
+        (permission,) = database.query(
+            "permissions_by_issuer_and_grantee", idUsersIssuedBy=1, idUsersIssuedTo=5
+        )
+
+        # Grant admin to some existing and some new grantees.
+        admin = PermissionFlags(True, True, True)
+        counts = Permission.grant(
+            database, 1, {5: admin, 6: admin, 7: (True, True), 8: admin, 9: admin}
+        )
+        assert counts.inserted == 2
+        assert counts.updated == 3
+
+        # Updates keep the public id of the permission.
+        (updated,) = database.query(
+            "permissions_by_issuer_and_grantee", idUsersIssuedBy=1, idUsersIssuedTo=5
+        )
+        assert updated.permissionId == permission.permissionId
+        assert updated.userIssuedToIsAdmin
+
+        permissions = database.query("permissions_by_issuer", idUsersIssuedBy=1)
+        assert len(permissions) == 8
+        assert {
+            item.idUsersIssuedTo for item in permissions if item.userIssuedToIsAdmin
+        } == {5, 6, 8, 9}
+
+        assert Permission.revoke(database, 1, (2, 3, 5, 10), batch_size=2) == 3
+        assert len(database.query("permissions_by_issuer", idUsersIssuedBy=1)) == 5
+
+
+class TestReplicas:
+    @staticmethod
+    def test_routing(replicated_database):
+
+        # Write to the primary only. The replica has not caught up.
+        with replicated_database.sessionmaker() as session:
+            session.add(User(idUsers=1, userId="primary", userName="primary"))
+            session.commit()
+
+        assert replicated_database.scalars(select(User)) == ()
+        assert replicated_database.serial(select(User)) == ()
+        assert replicated_database.query("user_by_user_id", userId="primary") == ()
+
+        # Read your writes.
+        (user,) = replicated_database.scalars(select(User), primary=True)
+        assert user.userId == "primary"
+        (user,) = replicated_database.query(
+            "user_by_user_id", primary=True, userId="primary"
+        )
+        assert user.userId == "primary"
+
+    @staticmethod
+    def test_writes_go_to_primary(replicated_database):
+
+        assert replicated_database.reader(primary=True) is (
+            replicated_database.sessionmaker
+        )
+        assert replicated_database.reader() is (
+            replicated_database.replicas_sessionmakers[0]
+        )
@@ -0,0 +1,136 @@
+import json
+
+import pytest
+from wtsettings.history import History, diff, patch, rebuild
+
+DOCUMENT = {
+    "actions": {
+        "Clear": [
+            {"keys": "alt+x", "command": {"action": "sendInput", "input": "clear\r"}},
+            {"keys": "alt+shift+x", "command": "clear"},
+        ],
+        "Misc": [{"keys": "ctrl+v", "command": "paste"}],
+    },
+    "copyOnSelect": False,
+}
+
+
+class TestDelta:
+    @staticmethod
+    @pytest.mark.parametrize(
+        "old, new",
+        [
+            (DOCUMENT, DOCUMENT),
+            (DOCUMENT, {**DOCUMENT, "copyOnSelect": True}),
+            (DOCUMENT, {"actions": {}}),
+            (DOCUMENT, {**DOCUMENT, "actions": {"Clear": []}}),
+            ([1, 2, 3], [1]),
+            ([1], [1, 2, {"a": [3]}]),
+            ({"a": [1, {"b": 2}]}, {"a": [1, {"b": 3, "c": 4}]}),
+            ({"a": 1}, [1]),
+            ({"a": 1, "b": 2}, {"b": 2, "a": 1}),
+            ({"a": 1, "b": 2, "c": 3}, {"c": 3, "d": 4, "a": 0}),
+            ({"a": 1}, {"a": True}),
+            ({"a": [0, 1.0]}, {"a": [False, 1]}),
+        ],
+    )
+    def test_patch_diff(old, new):
+
+        patched = patch(old, diff(old, new))
+        assert json.dumps(patched) == json.dumps(new)
+        if isinstance(new, dict):
+            assert list(patched) == list(new)
+
+    @staticmethod
+    def test_diff_is_structural():
+
+        new = {**DOCUMENT, "copyOnSelect": True}
+        assert diff(DOCUMENT, new) == [["set", ["copyOnSelect"], True]]
+        assert diff(DOCUMENT, DOCUMENT) == []
+
+    @staticmethod
+    def test_diff_reorder():
+
+        assert diff({"a": 1, "b": 2}, {"b": 2, "a": 1}) == [["order", [], ["b", "a"]]]
+        assert diff({"a": 1, "b": 2}, {"a": 1, "c": 3}) == [
+            ["del", ["b"]],
+            ["set", ["c"], 3],
+        ]
+
+
+@pytest.fixture
+def history(database, users):
+
+    return History(database, snapshot_interval=3)
+
+
+class TestHistory:
+    @staticmethod
+    def test_commit_checkout(history):
+
+        documents = []
+        for k in range(7):
+            document = {
+                **DOCUMENT,
+                "actions": {**DOCUMENT["actions"], f"Subsection{k}": []},
+            }
+            documents.append(document)
+            assert history.commit(1, document) == k + 1
+
+        for version, document in enumerate(documents, start=1):
+            assert history.checkout(1, version) == document
+        assert history.checkout(1) == documents[-1]
+
+        # Versions 1, 4, and 7 are snapshots.
+        versions = history.versions(1)
+        assert tuple(item["settingsVersion"] for item in versions) == tuple(
+            range(1, 8)
+        )
+        assert tuple(
+            item["settingsVersion"] for item in versions if item["settingsIsSnapshot"]
+        ) == (1, 4, 7)
+
+    @staticmethod
+    def test_rollback(history):
+
+        history.commit(1, DOCUMENT)
+        history.commit(1, {**DOCUMENT, "copyOnSelect": True})
+
+        assert history.rollback(1, 1) == 3
+        assert history.checkout(1) == DOCUMENT
+
+    @staticmethod
+    def test_checkout_keeps_order(history):
+
+        reordered = {
+            **DOCUMENT,
+            "actions": dict(reversed(tuple(DOCUMENT["actions"].items()))),
+        }
+        history.commit(1, DOCUMENT)
+        history.commit(1, reordered)
+
+        assert list(history.checkout(1, 1)["actions"]) == ["Clear", "Misc"]
+        assert list(history.checkout(1, 2)["actions"]) == ["Misc", "Clear"]
+
+    @staticmethod
+    def test_versions_primary(replicated_database):
+
+        history = History(replicated_database)
+        history.commit(1, DOCUMENT)
+
+        # The replica has not caught up.
+        assert history.versions(1) == ()
+        assert len(history.versions(1, primary=True)) == 1
+
+    @staticmethod
+    def test_latest_contents(history):
+
+        documents = [{**DOCUMENT, "copyOnSelect": bool(k % 2)} for k in range(5)]
+        for document in documents:
+            history.commit(1, document)
+
+        # Version 4 is the latest snapshot.
+        ((version, contents),) = history.latest_contents([1, 2]).values()
+        assert version == 5
+        assert len(contents) == 2
+        assert rebuild(contents) == documents[-1]
@@ -0,0 +1,93 @@
+import json
+
+from wtsettings import jsonc
+
+DOCUMENT = """// Leading comment.
+{
+    "$schema": "https://aka.ms/terminal-profiles-schema",
+    // The default profile.
+    "defaultProfile": "{61c54bbd-c2c6-5271-96e7-009a87ff44bf}",
+    "copyOnSelect": false, /* Inline. */
+    "url": "http://not/a/comment",
+    "actions": [
+        // First action.
+        { "command": "paste", "keys": "ctrl+v", },
+        { "command": "copy", "keys": "ctrl+c" },
+        // Trailing comment in actions.
+    ],
+}
+"""
+
+
+class TestJSONC:
+    @staticmethod
+    def test_loads():
+
+        data = jsonc.loads(DOCUMENT)
+        assert data["url"] == "http://not/a/comment"
+        assert data["copyOnSelect"] is False
+        assert len(data["actions"]) == 2
+        assert data["actions"][0] == {"command": "paste", "keys": "ctrl+v"}
+
+    @staticmethod
+    def test_loads_matches_json():
+
+        data = {"a": [1, 2, {"b": "// /* , ]"}], "c": None}
+        assert jsonc.loads(json.dumps(data, indent=2)) == data
+
+    @staticmethod
+    def test_comments():
+
+        document = jsonc.loads_document(DOCUMENT)
+        anchors = {
+            comment.text: (comment.path, comment.trailing)
+            for comment in document.comments
+        }
+
+        assert anchors["// Leading comment."] == (("$schema",), False)
+        assert anchors["// The default profile."] == (("defaultProfile",), False)
+        assert anchors["/* Inline. */"] == (("url",), False)
+        assert anchors["// First action."] == (("actions", 0), False)
+        assert anchors["// Trailing comment in actions."] == (("actions",), True)
+
+        for comment in document.comments:
+            assert DOCUMENT[comment.offset :].startswith(comment.text)
+
+    @staticmethod
+    def test_dumps_round_trip():
+
+        document = jsonc.loads_document(DOCUMENT)
+        dumped = jsonc.dumps(document.data, document.comments)
+
+        assert jsonc.loads(dumped) == document.data
+        redocument = jsonc.loads_document(dumped)
+        assert tuple((c.path, c.text, c.trailing) for c in redocument.comments) == tuple(
+            (c.path, c.text, c.trailing) for c in document.comments
+        )
+
+    @staticmethod
+    def test_dumps_round_trip_scalars():
+
+        document = jsonc.loads_document('{"a": [ // a\n 1, // b\n true, null ]}')
+        assert tuple((c.path, c.trailing) for c in document.comments) == (
+            (("a", 0), False),
+            (("a", 1), False),
+        )
+
+        dumped = jsonc.dumps(document.data, document.comments)
+        assert dumped.index("// a") < dumped.index("1,") < dumped.index("// b")
+        assert dumped.index("// b") < dumped.index("true")
+        assert jsonc.loads_document(dumped).comments[1].path == ("a", 1)
+
+    @staticmethod
+    def test_dumps_round_trip_empty_containers():
+
+        text = '{"profiles": {"defaults": { // Put settings here\n }, "list": []}}'
+        document = jsonc.loads_document(text)
+        dumped = jsonc.dumps(document.data, document.comments)
+
+        assert jsonc.loads(dumped) == document.data
+        (comment,) = jsonc.loads_document(dumped).comments
+        assert comment.path == ("profiles", "defaults")
+        assert comment.text == "// Put settings here"
+        assert comment.trailing
@@ -0,0 +1,176 @@
+import pytest
+from pydantic import ValidationError
+from wtsettings.__main__ import Config, WTSettingsYAMLSchema
+from wtsettings.cache import RenderCache
+from wtsettings.layers import LayeredStore, compile_layer, merge_layers
+
+BASE = """
+actions :
+  Clear :
+    - command : "clear"
+      keys : "alt+x"
+    - command : "clear"
+      keys : "alt+shift+x"
+  Misc :
+    - command : "paste"
+      keys : "ctrl+v"
+"""
+
+TEAM = """
+actions :
+  Clear :
+    - command : "cls"
+      keys : "alt+x"
+    - command : null
+      keys : "alt+shift+x"
+  Helm :
+    - command : "helm list -A"
+      keys : "alt+h"
+"""
+
+USER = """
+actions :
+  Misc : null
+  Helm :
+    - command : "helm list"
+      keys : "alt+h"
+"""
+
+
+@pytest.fixture
+def filepaths(tmp_path):
+
+    filepaths = []
+    for name, content in (("base", BASE), ("team", TEAM), ("user", USER)):
+        filepath = tmp_path / f"{name}.yaml"
+        filepath.write_text(content)
+        filepaths.append(filepath)
+
+    return filepaths
+
+
+class TestLayers:
+    @staticmethod
+    def test_merge():
+
+        merged = merge_layers(compile_layer(BASE), compile_layer(TEAM))
+        assert merged["actions"]["Clear"] == {
+            "alt+x": {"command": "cls", "keys": "alt+x"}
+        }
+        assert set(merged["actions"]) == {"Clear", "Misc", "Helm"}
+
+        merged = merge_layers(merged, compile_layer(USER))
+        assert set(merged["actions"]) == {"Clear", "Helm"}
+        assert merged["actions"]["Helm"]["alt+h"]["command"] == "helm list"
+
+    @staticmethod
+    def test_load_caches_prefixes(filepaths, monkeypatch):
+
+        store = LayeredStore()
+        document = store.load(filepaths)
+        assert document["actions"]["Helm"] == [
+            {"command": "helm list", "keys": "alt+h"}
+        ]
+
+        # Changing the last overlay reuses the merge of the layers before it.
+        compiled = []
+        monkeypatch.setattr(
+            "wtsettings.layers.compile_layer",
+            lambda content: compiled.append(content) or compile_layer(content),
+        )
+        filepaths[-1].write_text(USER.replace("helm list", "helm ls"))
+        document = store.load(filepaths)
+        assert document["actions"]["Helm"][0]["command"] == "helm ls"
+        assert len(compiled) == 1
+
+        # Nothing changed, nothing is compiled.
+        store.load(filepaths)
+        assert len(compiled) == 1
+
+    @staticmethod
+    def test_load_disk_cache(filepaths, tmp_path):
+
+        cache = RenderCache(str(tmp_path / "cache"), max_bytes=2**20)
+        document = LayeredStore().load(filepaths, cache)
+        assert LayeredStore().load(filepaths, cache) == document
+
+    @staticmethod
+    def test_schema_load(filepaths, tmp_path):
+
+        config = Config(
+            YAMLConfig=str(filepaths[0]),
+            YAMLOverlays=[str(filepath) for filepath in filepaths[1:]],
+            RenderCache=str(tmp_path / "cache"),
+        )
+        wtsettings = WTSettingsYAMLSchema.load(config)
+        assert tuple(wtsettings.actions) == ("Clear", "Helm")
+        assert WTSettingsYAMLSchema.digest(config) != WTSettingsYAMLSchema.digest(
+            Config(YAMLConfig=str(filepaths[0]))
+        )
+
+    @staticmethod
+    def test_schema_load_digested(filepaths, tmp_path, monkeypatch):
+
+        import wtsettings.__main__
+
+        config = Config(
+            YAMLConfig=str(filepaths[0]),
+            YAMLOverlays=[str(filepath) for filepath in filepaths[1:]],
+            RenderCache=str(tmp_path / "cache"),
+        )
+
+        opened = []
+
+        def open_(filepath, *args, **kwargs):
+            opened.append(filepath)
+            return open(filepath, *args, **kwargs)
+
+        monkeypatch.setattr(wtsettings.__main__, "open", open_, raising=False)
+        wtsettings_, digest = WTSettingsYAMLSchema.load_digested(config)
+        monkeypatch.undo()
+
+        # Every file is read once and the digest is of the content that was parsed.
+        assert sorted(opened) == sorted(str(filepath) for filepath in filepaths)
+        assert wtsettings_ == WTSettingsYAMLSchema.load(config)
+        assert digest == WTSettingsYAMLSchema.digest(config)
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "content",
+        [
+            "actions :\n  Clear :\n    - command : clear\n",
+            "actions :\n  Clear :\n    keys : alt+x\n    command : clear\n",
+            "actions :\n  - Clear\n",
+            "- actions\n",
+        ],
+    )
+    def test_compile_layer_malformed(content):
+
+        with pytest.raises(ValidationError):
+            compile_layer(content.encode())
+
+    @staticmethod
+    def test_load_returns_copy(filepaths):
+
+        store = LayeredStore()
+        document = store.load(filepaths)
+        document["actions"]["Clear"][0]["command"] = "changed"
+        document["actions"]["Clear"].clear()
+
+        assert store.load(filepaths)["actions"]["Clear"][0]["command"] == "cls"
+
+    @staticmethod
+    def test_compile_layer_matches_disk_cache(tmp_path):
+
+        filepath = tmp_path / "base.yaml"
+        filepath.write_text(
+            "updated : 2024-01-01\nactions :\n  1 :\n    - command : clear\n      keys : 1\n"
+        )
+        cache = RenderCache(str(tmp_path / "cache"), max_bytes=2**20)
+
+        compiled = LayeredStore().load([filepath], cache)
+        assert compiled == {
+            "updated": "2024-01-01",
+            "actions": {"1": [{"keys": "1", "command": "clear"}]},
+        }
+        assert LayeredStore().load([filepath], cache) == compiled
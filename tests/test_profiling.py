@@ -0,0 +1,58 @@
+import json
+
+from wtsettings.profiling import Profiler
+
+
+class TestProfiler:
+    @staticmethod
+    def test_disabled():
+
+        profiler = Profiler()
+        with profiler.phase("parse"):
+            ...
+
+        assert profiler.timings == {}
+
+    @staticmethod
+    def test_report(tmp_path):
+
+        profiler = Profiler()
+        profiler.enable(dump_directory=str(tmp_path))
+        for _ in range(2):
+            with profiler.phase("parse"):
+                sum(range(1000))
+        with profiler.phase("dumps"):
+            json.dumps({})
+
+        summary = profiler.summary()
+        assert summary["parse"]["calls"] == 2
+        assert summary["dumps"]["calls"] == 1
+
+        report = json.loads(profiler.report("json"))
+        assert set(report["phases"]) == {"parse", "dumps"}
+        assert report["total"] >= report["phases"]["parse"]["seconds"]
+        assert profiler.report().splitlines()[1].startswith("parse")
+
+        profiler.dump()
+        assert {item.name for item in tmp_path.iterdir()} == {
+            "parse.pstats",
+            "dumps.pstats",
+        }
+
+    @staticmethod
+    def test_report_excludes_input():
+
+        profiler = Profiler()
+        profiler.enable()
+        # An hour spent answering prompts and a hundredth of a second parsing.
+        profiler.created -= 3600.01
+        profiler.record("parse", 0.01)
+        profiler.record("input", 3600.0)
+
+        report = json.loads(profiler.report("json"))
+        assert report["phases"]["input"]["seconds"] == 3600.0
+        assert 0.01 <= report["total"] < 1.0
+
+        rows = {row.split()[0]: row.split() for row in profiler.report().splitlines()}
+        assert len(rows["input"]) == 3
+        assert float(rows["parse"][3]) > 1.0
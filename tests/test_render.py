@@ -0,0 +1,63 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import select
+from wtsettings.database import Render
+from wtsettings.history import History
+from wtsettings.render import render_document, render_users
+
+from .fixtures import create_store
+
+
+@pytest.fixture
+def history(database, users):
+
+    history = History(database)
+    for k in range(1, 6):
+        history.commit(k, create_store(k).dict())
+
+    # A broken document.
+    history.commit(6, {"actions": {}})
+    return history
+
+
+class TestRender:
+    @staticmethod
+    def test_render_document():
+
+        rendered = json.loads(render_document(create_store(3).dict()))
+        assert len(rendered["actions"]) == 3
+        assert rendered["profiles"]["list"][0]["guid"] == "guid-0"
+
+    @staticmethod
+    def test_render_users(database, history):
+
+        with ThreadPoolExecutor(2) as executor:
+            report = render_users(
+                database, history, chunk_size=2, max_in_flight=3, executor=executor
+            )
+
+        assert report.users == 10
+        assert report.rendered == 5
+        assert report.failed == 1
+        assert report.skipped == 4
+
+        renders = database.serial(select(Render), primary=True)
+        assert sorted(item["idUsers"] for item in renders) == [1, 2, 3, 4, 5]
+        assert all(item["renderVersion"] == 1 for item in renders)
+
+    @staticmethod
+    def test_render_users_process_pool(database, history):
+
+        # The latest version of user 1 is rebuilt from a snapshot and a delta.
+        history.commit(1, create_store(2).dict())
+
+        report = render_users(database, history, chunk_size=2, max_workers=2)
+        assert report[:4] == (10, 5, 1, 4)
+
+        (render,) = database.serial(
+            select(Render).where(Render.idUsers == 1), primary=True
+        )
+        assert render["renderVersion"] == 2
+        assert len(json.loads(render["renderContent"])["actions"]) == 2
@@ -0,0 +1,26 @@
+from wtsettings.sync import sync
+
+from .fixtures import create_store
+
+
+class TestSync:
+    @staticmethod
+    def test_sync(database, users):
+
+        user = users[0]
+        report = sync(database, create_store(10), user)
+        assert report.actions.inserted == 10
+        assert report.schemes.inserted == report.profiles.inserted == 1
+
+        # Nothing changed, so nothing should be written.
+        report = sync(database, create_store(10), user)
+        assert not report.changed
+        assert report.actions.unchanged == 10
+
+        # Remove some actions and change another.
+        store = create_store(6)
+        store.actions["Clear"][0].command = "paste"
+        report = sync(database, store, user, batch_size=2)
+        assert report.actions.deleted == 4
+        assert report.actions.updated == 1
+        assert report.actions.unchanged == 5
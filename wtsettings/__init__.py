@@ -1,2 +1,5 @@
+# First, so that the import phase of ``wtsettings --profile`` covers the other imports.
+from .profiling import profiler  # isort: skip
+
 from .configuration import ApiConfiguration
 from .database import Database
@@ -10,32 +10,46 @@ TL;DR: This is almost entirely pointless beides some fun with esoteric math. Oth
 It is just a fun tool for adding json snippets from a perminant YAML store.
 """
 
+import argparse
 import json
 import re
 import shutil
 import sys
+import time
 from os import path
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import yaml
 from pydantic import BaseModel, BaseSettings
 
+from . import jsonc, layers
+from .cache import RenderCache
+from .profiling import profiler
+from .schemas import Profiles
+
+IMPORTED = time.perf_counter()
+
 
 class Config(BaseSettings):
     """Settings for interactive mode."""
 
     YAMLConfig: str = path.join(path.dirname(__file__), "settings.yaml")
     JSONConfig: str = "/mnt/c/Users/AdrianCederberg/AppData/Local/Packages/Microsoft.WindowsTerminalPreview_8wekyb3d8bbwe/LocalState"
+    YAMLOverlays: List[str] = []
+    RenderCache: str = path.join(path.expanduser("~"), ".cache", "wtsettings")
+    RenderCacheMaxBytes: int = 16 * 2**20
 
 
 class WTSettingsJSONSchema(BaseModel):
     """A Json for the windows terminal schemas."""
 
+    @classmethod
     def load(cls, config: Optional[Config] = None) -> "WTSettingsJSONSchema":
 
+        config = config if config is not None else Config()
+
         filepath = config.JSONConfig
-        with open(filepath, "r") as file:
-            return cls(**yaml.safe_load(file))
+        return cls(**jsonc.load(filepath))
 
 
 class WTSettingsYAMLSchema(BaseModel):
@@ -48,11 +62,11 @@ class WTSettingsYAMLSchema(BaseModel):
     ) -> "WTSettingsYAMLSchema":
 
         config = config if config is not None else Config()
+        if confattr is None:
+            return cls.parse(cls.read(config), config)
 
         filepath: str
-        if confattr is None:
-            filepath = config.YAMLConfig
-        elif hasattr(config, confattr) and isinstance(getattr(config, confattr), str):
+        if hasattr(config, confattr) and isinstance(getattr(config, confattr), str):
             filepath = getattr(config, confattr)
         else:
             raise Exception(
@@ -61,8 +75,72 @@ class WTSettingsYAMLSchema(BaseModel):
 
         assert filepath is not None, "Local 'filepath' must be defined."
 
-        with open(filepath, "r") as file:
-            return cls(**yaml.safe_load(file))
+        with open(filepath, "rb") as file:
+            return cls.parse((file.read(),), config)
+
+    @classmethod
+    def load_digested(
+        cls, config: Optional[Config] = None
+    ) -> Tuple["WTSettingsYAMLSchema", str]:
+        """Load the store and its overlays together with the digest of exactly the
+        content that was parsed, so that an edit can not be cached under the digest of
+        other content.
+        """
+
+        config = config if config is not None else Config()
+        contents = cls.read(config)
+        return cls.parse(contents, config), cls.digest(config, contents)
+
+    @staticmethod
+    def read(config: Config) -> Tuple[bytes, ...]:
+        """Read the store and its overlays."""
+
+        contents = []
+        for filepath in (config.YAMLConfig, *config.YAMLOverlays):
+            with open(filepath, "rb") as file:
+                contents.append(file.read())
+
+        return tuple(contents)
+
+    @classmethod
+    def parse(
+        cls, contents: Tuple[bytes, ...], config: Config
+    ) -> "WTSettingsYAMLSchema":
+        """Parse a store, merging the overlays ``contents[1:]`` onto it."""
+
+        # Merge the overlays onto the store, see ``wtsettings.layers``.
+        if len(contents) > 1:
+            data = layers.store.load_contents(
+                contents, RenderCache(config.RenderCache, config.RenderCacheMaxBytes)
+            )
+        else:
+            with profiler.phase("parse"):
+                data = yaml.safe_load(contents[0])
+
+        with profiler.phase("validate"):
+            return cls(**data)
+
+    @classmethod
+    def digest(
+        cls,
+        config: Optional[Config] = None,
+        contents: Optional[Tuple[bytes, ...]] = None,
+    ) -> str:
+        """Digest of the store, which covers the content of every subsection, and of
+        its overlays.
+
+        :param contents: The contents of the store and its overlays, as returned by
+            :meth:`read`. Read from ``config`` when not given.
+        """
+
+        config = config if config is not None else Config()
+        contents = contents if contents is not None else cls.read(config)
+        if len(contents) == 1:
+            return RenderCache.digest_content(contents[0])
+
+        return RenderCache.key(
+            "layers", *(RenderCache.digest_content(content) for content in contents)
+        )
 
     class Action(BaseModel):
 
@@ -70,6 +148,7 @@ class WTSettingsYAMLSchema(BaseModel):
         command: Union[str, Dict]
 
     actions: Dict[str, List[Action]]
+    profiles: Optional[Profiles] = None
 
 
 class Main:
@@ -84,6 +163,8 @@ class Main:
         "Print all keybindings as JSON.",
         "Rerender wt settings from the given actions.",
         "Print a profile as json.",
+        "Show the render cache.",
+        "Clear the render cache.",
     )
 
     # Input methods
@@ -91,7 +172,8 @@ class Main:
     def input_yes(cls, prompt: str) -> bool:
         """Check that response matches any of the yes options."""
 
-        ans: str = input(prompt)
+        with profiler.phase("input"):
+            ans: str = input(prompt)
         return any(regexp.match(ans) is not None for regexp in cls.__yes__)
 
     @classmethod
@@ -100,7 +182,8 @@ class Main:
 
         input_: int
         try:
-            input_ = int(input())
+            with profiler.phase("input"):
+                input_ = int(input())
         except:
             print("That's not an integer. Try again:", end=" ")
             return -1
@@ -163,14 +246,97 @@ class Main:
 
         return ans
 
+    # Render methods
+    @classmethod
+    def render_subsection(
+        cls,
+        wtsettings: WTSettingsYAMLSchema,
+        subsection_name: str,
+        indent: Optional[int] = None,
+    ) -> str:
+        """Render the actions of one subsection as JSON."""
+
+        with profiler.phase("dict"):
+            items = tuple(item.dict() for item in wtsettings.actions[subsection_name])
+
+        with profiler.phase("dumps"):
+            return json.dumps(items, indent=indent)
+
+    @classmethod
+    def render_all(
+        cls, wtsettings: WTSettingsYAMLSchema, indent: Optional[int] = None
+    ) -> str:
+        """Render the actions of every subsection as JSON."""
+
+        with profiler.phase("dict"):
+            items = tuple(
+                item.dict()
+                for subsection in wtsettings.actions.values()
+                for item in subsection
+            )
+
+        with profiler.phase("dumps"):
+            return json.dumps(items, indent=indent)
+
+    @classmethod
+    def render_profiles(
+        cls, wtsettings: WTSettingsYAMLSchema, indent: Optional[int] = None
+    ) -> str:
+        """Render the profiles as JSON."""
+
+        with profiler.phase("dict"):
+            profiles = (
+                wtsettings.profiles.dict() if wtsettings.profiles is not None else None
+            )
+
+        with profiler.phase("dumps"):
+            return json.dumps(profiles, indent=indent)
+
+    @classmethod
+    def render_cached(
+        cls,
+        cache: Optional[RenderCache],
+        digest: Optional[str],
+        render: Callable[[], str],
+        *options: Any,
+    ) -> str:
+        """Read a render from ``cache`` or render it and write it to ``cache``.
+
+        :param cache: The render cache. When ``None`` this just calls ``render``.
+        :param digest: Digest of the store that is rendered.
+        :param render: Function to render on a miss.
+        :param options: The render options, which are part of the key.
+        """
+
+        if cache is None or digest is None:
+            return render()
+
+        key = cache.key(digest, *options)
+        with profiler.phase("cache"):
+            content = cache.get(key)
+
+        if content is None:
+            content = render()
+            with profiler.phase("cache"):
+                cache.put(key, content)
+
+        return content
+
     @classmethod
     def handle_subsection(
-        cls, wtsettings: WTSettingsYAMLSchema, render_all: bool = False
+        cls,
+        wtsettings: WTSettingsYAMLSchema,
+        render_all: bool = False,
+        cache: Optional[RenderCache] = None,
+        digest: Optional[str] = None,
     ) -> None:
         """Handle calling a subsection. This should represent the call signature for
         first level handler.
 
         :param wtsettings: configuration to read from.
+        :param cache: Cache for the rendered JSON.
+        :param digest: Digest of the store that ``wtsettings`` was loaded from. Renders
+            are only cached when this is provided.
         :returns: None.
         """
 
@@ -184,13 +350,12 @@ class Main:
         if render_all:
             print(delim)
             print(
-                json.dumps(
-                    tuple(
-                        item.dict()
-                        for subsection in wtsettings.actions.values()
-                        for item in subsection
-                    ),
-                    indent=indent,
+                cls.render_cached(
+                    cache,
+                    digest,
+                    lambda: cls.render_all(wtsettings, indent=indent),
+                    "all",
+                    indent,
                 )
             )
             print(delim)
@@ -204,9 +369,13 @@ class Main:
 
         print(delim)
         print(
-            json.dumps(
-                tuple(item.dict() for item in wtsettings.actions[subsection_name]),
-                indent=indent,
+            cls.render_cached(
+                cache,
+                digest,
+                lambda: cls.render_subsection(wtsettings, subsection_name, indent=indent),
+                "subsection",
+                subsection_name,
+                indent,
             )
         )
         print(delim)
@@ -214,6 +383,17 @@ class Main:
         # Exit successfully.
         sys.exit(0)
 
+    @classmethod
+    def handle_cache(cls, cache: RenderCache, clear: bool = False) -> None:
+        """Show the render cache statistics, or clear the render cache."""
+
+        if clear:
+            print(f"Removed {cache.clear()} entries from `{cache.directory}`.")
+        else:
+            print(json.dumps(cache.info(), indent=2))
+
+        sys.exit(0)
+
     def handle_rerender_actions(cls, wtsettings: WTSettingsYAMLSchema) -> None:
         """ """
 
@@ -231,19 +411,59 @@ class Main:
         )
 
         # Call the script associated with the option.
-        wtsettings: WTSettingsYAMLSchema = WTSettingsYAMLSchema.load(config=config)
+        config = config if config is not None else cls.config
+        cache = RenderCache(config.RenderCache, config.RenderCacheMaxBytes)
         match option_index:
-            case 0:
-                cls.handle_subsection(wtsettings)
-            case 1:
-                cls.handle_subsection(wtsettings, render_all=True)
+            case 0 | 1:
+                wtsettings, digest = WTSettingsYAMLSchema.load_digested(config)
+                cls.handle_subsection(
+                    wtsettings,
+                    render_all=option_index == 1,
+                    cache=cache,
+                    digest=digest,
+                )
+            case 4 | 5:
+                cls.handle_cache(cache, clear=option_index == 5)
             case _:
                 print("Undefined option.")
 
 
-def main():
-    return Main.invoke()
+def main(argv: Optional[List[str]] = None):
+
+    parser = argparse.ArgumentParser(
+        prog="wtsettings",
+        description="Render windows terminal settings from a YAML store.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time the imports, parse, merge, validate, dict, dumps and cache phases "
+        "and print a summary to stderr on exit.",
+    )
+    parser.add_argument(
+        "--profile-format",
+        choices=("table", "json"),
+        default="table",
+        help="Format of the profile summary.",
+    )
+    parser.add_argument(
+        "--profile-dump",
+        metavar="DIRECTORY",
+        help="Also write a pstats dump of each phase to DIRECTORY.",
+    )
+    args = parser.parse_args(argv)
+
+    if not args.profile:
+        return Main.invoke()
+
+    profiler.enable(dump_directory=args.profile_dump)
+    profiler.record("imports", IMPORTED - profiler.created)
+    try:
+        return Main.invoke()
+    finally:
+        profiler.dump()
+        print(profiler.report(args.profile_format), file=sys.stderr)
 
 
 if __name__ == "__main__":
-    Main.main()
+    main()
@@ -0,0 +1,225 @@
+"""FastAPI application serving the same snippets as the interactive mode.
+
+Every response is rendered and compressed once per version of the store, so that
+repeated requests only select a precomputed body. The version is a digest of the store
+and is used as the ``ETag`` of every response, so clients may poll ``/version`` or send
+``If-None-Match`` and receive ``304 Not Modified`` until the store changes.
+"""
+
+import gzip
+import logging
+import os
+from threading import Lock
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from fastapi import FastAPI, HTTPException, Request, Response
+
+from .__main__ import Config, Main, WTSettingsYAMLSchema
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class Rendered(NamedTuple):
+    """A response body in each of the supported encodings.
+
+    :attr identity: The uncompressed body.
+    :attr gzip: The gzip compressed body.
+    :attr br: The brotli compressed body. ``None`` when ``brotli`` is not installed.
+    """
+
+    identity: bytes
+    gzip: bytes
+    br: Optional[bytes]
+
+    @classmethod
+    def create(cls, content: str) -> "Rendered":
+
+        identity = content.encode()
+        return cls(
+            identity,
+            gzip.compress(identity, compresslevel=9),
+            brotli.compress(identity) if brotli is not None else None,
+        )
+
+    def encode(self, accept_encoding: str) -> Tuple[Optional[str], bytes]:
+        """Choose the smallest body the client accepts.
+
+        :param accept_encoding: The ``Accept-Encoding`` header of the request.
+        :returns: The content encoding (``None`` for identity) and the body.
+        """
+
+        # Quality values by encoding. ``q=0`` refuses an encoding.
+        qualities: Dict[str, float] = {}
+        for item in accept_encoding.split(","):
+            name, *params = (part.strip() for part in item.split(";"))
+            quality = 1.0
+            for param in params:
+                key, _, value = param.partition("=")
+                if key.strip().lower() == "q":
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0.0
+            qualities[name.lower()] = quality
+
+        def accepts(encoding: str) -> bool:
+            return qualities.get(encoding, qualities.get("*", 0.0)) > 0
+
+        if self.br is not None and accepts("br"):
+            return "br", self.br
+        if accepts("gzip"):
+            return "gzip", self.gzip
+        return None, self.identity
+
+
+class RenderedStore:
+    """The rendered responses for the current version of the YAML store.
+
+    The store and its overlays are only reread when a modification time or size
+    changes and only rerendered when their digest changes.
+
+    :attr config: Configuration specifying the location of the store.
+    :attr snapshot: Digest of the store and the responses rendered for it, keyed by
+        ``actions``, ``actions/<subsection>`` and ``profiles``. Both are replaced
+        together, so a reader of the snapshot never pairs a body with another version.
+    """
+
+    def __init__(self, config: Optional[Config] = None):
+
+        self.config: Config = config if config is not None else Config()
+        self.snapshot: Tuple[Optional[str], Dict[str, Rendered]] = (None, {})
+        self._stat: Optional[Tuple[Tuple[int, int], ...]] = None
+        self._lock = Lock()
+
+    @staticmethod
+    def render(wtsettings: WTSettingsYAMLSchema) -> Dict[str, Rendered]:
+        """Render every response for ``wtsettings``."""
+
+        rendered = {
+            f"actions/{subsection_name}": Rendered.create(
+                Main.render_subsection(wtsettings, subsection_name)
+            )
+            for subsection_name in wtsettings.actions
+        }
+        rendered["actions"] = Rendered.create(Main.render_all(wtsettings))
+        if wtsettings.profiles is not None:
+            rendered["profiles"] = Rendered.create(Main.render_profiles(wtsettings))
+
+        return rendered
+
+    def refresh(self) -> Tuple[str, Dict[str, Rendered]]:
+        """Rerender the responses if the store changed.
+
+        :returns: The snapshot of the version of the store and its responses.
+        """
+
+        filepaths = (self.config.YAMLConfig, *self.config.YAMLOverlays)
+        stat = tuple(
+            (item.st_mtime_ns, item.st_size) for item in map(os.stat, filepaths)
+        )
+        if stat == self._stat:
+            return self.snapshot
+
+        with self._lock:
+            contents = WTSettingsYAMLSchema.read(self.config)
+            version = WTSettingsYAMLSchema.digest(self.config, contents)
+            if version != self.snapshot[0]:
+                logging.info(f"Rendering version `{version}` of `{filepaths}`.")
+                wtsettings = WTSettingsYAMLSchema.parse(contents, self.config)
+                self.snapshot = (version, self.render(wtsettings))
+
+            self._stat = stat
+            return self.snapshot
+
+    def respond(self, key: str, request: Request) -> Response:
+        """Create the response for ``key``, honouring ``If-None-Match`` and
+        ``Accept-Encoding``.
+        """
+
+        version, responses = self.refresh()
+        rendered = responses.get(key)
+        if rendered is None:
+            raise HTTPException(404, detail=f"No such resource `{key}`.")
+
+        etag = f'"{version}"'
+        headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+
+        encoding, body = rendered.encode(request.headers.get("accept-encoding", ""))
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+
+        return Response(body, media_type="application/json", headers=headers)
+
+
+def create_app(store: Optional[RenderedStore] = None) -> FastAPI:
+    """Create the application.
+
+    :param store: The rendered store to serve from. Defaults to the store specified by
+        ``Config``.
+    """
+
+    store = store if store is not None else RenderedStore()
+    app = FastAPI(title="wtsettings")
+    app.state.store = store
+
+    @app.get("/version")
+    def version(request: Request) -> Response:
+        """The current version of the store. This is the cheapest way to poll."""
+
+        version, _ = store.refresh()
+        etag = f'"{version}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+
+        return Response(
+            f'{{"version": "{version}"}}',
+            media_type="application/json",
+            headers={"ETag": etag},
+        )
+
+    @app.get("/actions")
+    def actions(request: Request) -> Response:
+        """All actions, as rendered by the second option of the interactive mode."""
+
+        return store.respond("actions", request)
+
+    @app.get("/actions/{subsection_name}")
+    def subsection(subsection_name: str, request: Request) -> Response:
+        """The actions of one subsection."""
+
+        return store.respond(f"actions/{subsection_name}", request)
+
+    @app.get("/profiles")
+    def profiles(request: Request) -> Response:
+        """The profiles of the store."""
+
+        return store.respond("profiles", request)
+
+    return app
+
+
+app = create_app()
+
+
+def main():
+
+    import uvicorn
+
+    from .configuration import ApiConfiguration
+
+    configuration = ApiConfiguration()
+    uvicorn.run(
+        "wtsettings.api:app",
+        host=configuration.uvicorn.host,
+        port=configuration.uvicorn.port,
+    )
+
+
+if __name__ == "__main__":
+    main()
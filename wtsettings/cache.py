@@ -0,0 +1,138 @@
+"""Content addressed on-disk cache for rendered snippets.
+
+Entries are files named by the digest of what was rendered and how. Reading an entry
+touches its modification time, so that evicting the entries with the oldest
+modification times once the cache exceeds its size bound is least recently used
+eviction.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+from os import path
+from typing import Any, Dict, Optional
+
+
+class RenderCache:
+    """A size bounded render cache in ``directory``.
+
+    :attr directory: Where entries are stored.
+    :attr max_bytes: Bound on the total size of the entries.
+    """
+
+    suffix = ".json"
+
+    def __init__(self, directory: str, max_bytes: int):
+
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def digest_content(content: bytes) -> str:
+        """Digest ``content``, e.g. of a store."""
+
+        return hashlib.sha256(content).hexdigest()
+
+    @staticmethod
+    def key(*parts: Any) -> str:
+        """Create the key for ``parts``, e.g. a digest of the content and the render
+        options.
+        """
+
+        return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+    def filepath(self, key: str) -> str:
+
+        return path.join(self.directory, key + self.suffix)
+
+    def get(self, key: str) -> Optional[str]:
+        """Read the entry for ``key``, ``None`` on a miss."""
+
+        filepath = self.filepath(key)
+        try:
+            with open(filepath, "r") as file:
+                content = file.read()
+        except FileNotFoundError:
+            return None
+
+        try:
+            os.utime(filepath)
+        except FileNotFoundError:
+            # Evicted by another process since the read.
+            pass
+
+        return content
+
+    def put(self, key: str, content: str) -> None:
+        """Write the entry for ``key`` and evict entries until the cache fits."""
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        # Write then rename so that readers never see partial entries. The temporary
+        # file is unique, since other processes may be writing the same key.
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "w") as file:
+                file.write(content)
+            os.replace(temporary, self.filepath(key))
+        except BaseException:
+            os.remove(temporary)
+            raise
+
+        self.evict()
+
+    def entries(self) -> Dict[str, os.stat_result]:
+
+        if not path.isdir(self.directory):
+            return {}
+
+        return {
+            entry.path: entry.stat()
+            for entry in os.scandir(self.directory)
+            if entry.name.endswith(self.suffix)
+        }
+
+    def evict(self) -> int:
+        """Remove the least recently used entries until the cache fits.
+
+        :returns: The number of entries removed.
+        """
+
+        entries = self.entries()
+        total = sum(stat.st_size for stat in entries.values())
+
+        removed = 0
+        for filepath, stat in sorted(entries.items(), key=lambda item: item[1].st_mtime):
+            if total <= self.max_bytes:
+                break
+            os.remove(filepath)
+            total -= stat.st_size
+            removed += 1
+
+        if removed:
+            logging.info(f"Evicted {removed} entries from `{self.directory}`.")
+        return removed
+
+    def info(self) -> Dict[str, Any]:
+        """Statistics for the cache."""
+
+        entries = self.entries()
+        return {
+            "directory": self.directory,
+            "entries": len(entries),
+            "bytes": sum(stat.st_size for stat in entries.values()),
+            "max_bytes": self.max_bytes,
+        }
+
+    def clear(self) -> int:
+        """Remove every entry.
+
+        :returns: The number of entries removed.
+        """
+
+        entries = self.entries()
+        for filepath in entries:
+            os.remove(filepath)
+
+        return len(entries)
@@ -1,5 +1,5 @@
 from os import path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, BaseSettings
 from pydantic.env_settings import SettingsSourceCallable
@@ -18,6 +18,7 @@ class ApiConfiguration(BaseSettings):
     """Settings for FastApi, Uvicorn, and MySQL.
 
     :attr mysql: Setting for mysql.
+    :attr uvicorn: Settings for uvicorn.
     """
 
     class Config:
@@ -39,6 +40,8 @@ class ApiConfiguration(BaseSettings):
 
         :attr drivername: The driver to be used by sqlalchemy.
         :attr url: The url specification for the database connection.
+        :attr replicas: Url specifications for read replicas of the database. Read only
+            helpers of ``Database`` are spread over these.
         :attr use_ssl: Should the connection use SSL or not.
         :attr ssl_ca: A path to a certificate authority file, for instance you might want to use this
             with a connection to an azure mysql instance where the certifacte authority file is to be
@@ -49,25 +52,38 @@ class ApiConfiguration(BaseSettings):
             """Url specification for the database connection. Drivername is not in here since it must be
             specified as a separate argument to the url constructor.
 
-            :attr host: The hostname for the sqlinstance, for instance an ip address.
+            :attr host: The hostname for the sqlinstance, for instance an ip address. Not
+                required for ``sqlite``, where ``database`` is the path.
             :attr port: The port on the host to which mysql should connect.
             :attr username: The username for the user to be used on this host.
             :attr password: The corresponding password for this username.
             """
 
-            host: str
+            host: Optional[str]
             port: Optional[int]
-            username: str
-            password: str
+            username: Optional[str]
+            password: Optional[str]
             database: str
 
         drivername: str
         url: MySqlUrlConfiguration
+        replicas: List[MySqlUrlConfiguration] = []
         use_ssl: bool = False
         echo: bool = False
         ssl_ca: Optional[str]
 
+    class UvicornConfiguration(BaseModel):
+        """Settings for serving ``wtsettings.api:app``.
+
+        :attr host: The address to bind to.
+        :attr port: The port to bind to.
+        """
+
+        host: str = "0.0.0.0"
+        port: int = 8000
+
     mysql: MySqlConfiguration
+    uvicorn: UvicornConfiguration = UvicornConfiguration()
 
 
 def main():
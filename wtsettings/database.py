@@ -1,4 +1,6 @@
 import abc
+import base64
+import json
 import logging
 import random
 import secrets
@@ -6,28 +8,100 @@ from collections import OrderedDict
 from datetime import date, datetime
 from functools import wraps
 from sys import exit
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
-
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    bindparam,
+    delete,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects import mysql, sqlite
 from sqlalchemy.engine import URL, Engine, create_engine
 from sqlalchemy.engine.result import ChunkedIteratorResult, Result
 from sqlalchemy.ext.declarative import DeclarativeMeta, declarative_base
 from sqlalchemy.inspection import inspect
 from sqlalchemy.orm import registry, sessionmaker
 from sqlalchemy.orm.decl_api import declarative_base
-from sqlalchemy.sql.schema import Column, ForeignKey
+from sqlalchemy.sql.schema import Column, ForeignKey, Table
+from sqlalchemy.types import JSON
 from typing_extensions import Self
 
 from .configuration import ApiConfiguration
 
 
+class Page(NamedTuple):
+    """A page of results from :meth:`Database.paginate`.
+
+    :attr items: The serialized rows of the page.
+    :attr cursor: Opaque cursor for the next page. ``None`` when this is the last page.
+    """
+
+    items: Tuple[Dict, ...]
+    cursor: Optional[str]
+
+
+class CursorError(ValueError):
+    """A cursor passed to :meth:`Database.paginate` is malformed or not for its keys."""
+
+
+class CompiledCache(dict):
+    """Compiled statement cache for named queries. Counts hits and misses so that the
+    hit rate is visible.
+
+    ``sqlalchemy`` looks up compiled statements with ``get`` and stores them with item
+    assignment, see the ``compiled_cache`` execution option.
+    """
+
+    def __init__(self):
+
+        super().__init__()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def get(self, key, default=None):
+
+        value = super().get(key, default)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return value
+
+
 class Database:
     """Class for all of the inconvenient ``sqlalchemy`` stuff.
 
     :attr Registry:
     :attr Base:
-    :attr engine:
-    :attr sessionmaker:
+    :attr engine: Engine for the primary.
+    :attr sessionmaker: Sessionmaker for the primary.
+    :attr replicas: Engines for the read replicas.
+    :attr replicas_sessionmakers: Sessionmakers for the read replicas.
+    :attr queries: Named queries, see :meth:`register_query`.
+    :attr queries_calls: Number of executions of each named query.
+    :attr compiled_cache: Compiled statement cache for the named queries.
     """
 
     class Base(
@@ -89,6 +163,8 @@ class Database:
                     return lambda: random.randint(0, 2**12)
                 case ["VARCHAR", length_as_str]:
                     return lambda: secrets.token_urlsafe(int(length_as_str) // 2)
+                case "JSON":
+                    return lambda: {}
                 case _:
                     logging.fatal(f"Undefined dummy field {column}.")
                     raise Exception(f"Undefined dummy field {column}.")
@@ -157,39 +233,293 @@ class Database:
         self.engine: Engine = self.create_engine()
         self.sessionmaker: sessionmaker = sessionmaker(self.engine)
 
-    def create_engine(self) -> Engine:
+        self.replicas: Tuple[Engine, ...] = tuple(
+            self.create_engine(url) for url in self.configuration.mysql.replicas
+        )
+        self.replicas_sessionmakers: Tuple[sessionmaker, ...] = tuple(
+            sessionmaker(engine) for engine in self.replicas
+        )
+        self._replicas_turn: int = 0
+
+        self.queries: Dict[str, Any] = {}
+        self.queries_calls: Dict[str, int] = {}
+        self.compiled_cache: CompiledCache = CompiledCache()
+        self.register_queries()
 
+    def create_engine(
+        self, url: Optional[ApiConfiguration.MySqlConfiguration.MySqlUrlConfiguration] = None
+    ) -> Engine:
+        """Create an engine for ``url``, which defaults to the primary."""
+
+        url = url if url is not None else self.configuration.mysql.url
         return create_engine(
-            URL.create(
-                self.configuration.mysql.drivername,
-                **self.configuration.mysql.url.dict(),
-            ),
+            URL.create(self.configuration.mysql.drivername, **url.dict()),
             echo=self.configuration.mysql.echo,
         )
 
+    def reader(self, primary: bool = False) -> sessionmaker:
+        """Choose the sessionmaker for a read.
+
+        The replica with the fewest checked out connections is used, ties are broken
+        round robin. Without replicas, or when ``primary`` is set for read-your-writes,
+        this is :attr:`sessionmaker`.
+        """
+
+        if primary or not self.replicas:
+            return self.sessionmaker
+
+        def busy(index: int) -> int:
+            # Pools without connection tracking, e.g. ``NullPool``, are never busy.
+            pool = self.replicas[index].pool
+            return pool.checkedout() if hasattr(pool, "checkedout") else 0
+
+        n = len(self.replicas)
+        self._replicas_turn = (self._replicas_turn + 1) % n
+        index = min(((self._replicas_turn + k) % n for k in range(n)), key=busy)
+        return self.replicas_sessionmakers[index]
+
     def exec_(
-        self, stmt, callback: Optional[Callable[[Result], Any]] = None
+        self,
+        stmt,
+        callback: Optional[Callable[[Result], Any]] = None,
+        primary: bool = True,
     ) -> Union[ChunkedIteratorResult, Result]:
+        """Execute ``stmt``. This uses the primary unless ``primary`` is ``False``, in
+        which case ``stmt`` must be read only.
+        """
 
-        with self.sessionmaker() as session:
+        with self.reader(primary)() as session:
 
             results = session.execute(stmt)
             return results if callback is None else callback(results)
 
-    def scalars(self, stmt) -> Tuple:
+    def scalars(self, stmt, primary: bool = False) -> Tuple:
 
-        return self.exec_(stmt, callback=lambda results: tuple(results.scalars()))
+        return self.exec_(
+            stmt, callback=lambda results: tuple(results.scalars()), primary=primary
+        )
+
+    @staticmethod
+    def serialize(item) -> Dict:
+        """Default serializer, maps the column attributes of an orm object."""
+
+        return {
+            attr.key: getattr(item, attr.key)
+            for attr in inspect(item).mapper.column_attrs
+        }
 
     def serial(
-        self, stmt, serializer: Optional[Callable[[Any], Dict]] = None
+        self,
+        stmt,
+        serializer: Optional[Callable[[Any], Dict]] = None,
+        primary: bool = False,
     ) -> Tuple[Dict]:
 
+        serializer = serializer if serializer is not None else self.serialize
         return self.exec_(
             stmt,
             callback=lambda results: tuple(
                 serializer(item) for item in results.scalars()
             ),
+            primary=primary,
+        )
+
+    @staticmethod
+    def encode_cursor(values: Tuple) -> str:
+        """Encode the key values of a row as a cursor. Values that are not JSON, e.g.
+        dates or decimals, are encoded as their ISO format or string.
+        """
+
+        def default(value: Any) -> str:
+            return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+        return base64.urlsafe_b64encode(
+            json.dumps(values, default=default).encode()
+        ).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str, keys: Tuple[Column, ...]) -> Tuple:
+        """Decode a cursor of :meth:`encode_cursor` to values of the types of ``keys``.
+
+        :raises CursorError: When ``cursor`` is malformed or not for ``keys``.
+        """
+
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if not isinstance(values, list) or len(values) != len(keys):
+                raise CursorError(f"Cursor `{cursor}` is not for {len(keys)} keys.")
+
+            decoded = []
+            for key, value in zip(keys, values):
+                python_type = key.type.python_type
+                if isinstance(value, str) and python_type is not str:
+                    value = (
+                        python_type.fromisoformat(value)
+                        if hasattr(python_type, "fromisoformat")
+                        else python_type(value)
+                    )
+                decoded.append(value)
+        except CursorError:
+            raise
+        except (ValueError, TypeError, ArithmeticError) as err:
+            raise CursorError(f"Malformed cursor `{cursor}`.") from err
+
+        return tuple(decoded)
+
+    def paginate(
+        self,
+        stmt,
+        keys: Tuple[Column, ...],
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        serializer: Optional[Callable[[Any], Dict]] = None,
+        primary: bool = False,
+    ) -> Page:
+        """Keyset pagination of ``stmt``.
+
+        Instead of an offset, each page continues after the keys of the last row of the
+        previous page, so that any page costs the same as the first when ``keys`` is
+        indexed.
+
+        :param stmt: A select of a single orm entity. Any ordering of ``stmt`` is replaced
+            by ``keys``, since the pages seek by them.
+        :param keys: Columns to order and seek by, for instance ``(User.idUsers,)``. These
+            must be unique together, so include the primary key when using other indexed
+            columns.
+        :param cursor: The cursor of the previous page. ``None`` for the first page.
+        :param limit: The maximum number of rows in the page.
+        :param serializer: Serializer for the rows. Defaults to :meth:`serialize`.
+        :param primary: Read from the primary instead of a replica.
+        :returns: The page and the cursor of the next page.
+        :raises CursorError: When ``cursor`` is malformed.
+        """
+
+        serializer = serializer if serializer is not None else self.serialize
+
+        stmt = stmt.order_by(None).order_by(*keys).limit(limit + 1)
+        if cursor is not None:
+            stmt = stmt.where(tuple_(*keys) > tuple_(*self.decode_cursor(cursor, keys)))
+
+        def callback(results: Result) -> Page:
+
+            items = tuple(results.scalars())
+            if len(items) <= limit:
+                return Page(tuple(serializer(item) for item in items), None)
+
+            items = items[:limit]
+            last = items[-1]
+            return Page(
+                tuple(serializer(item) for item in items),
+                self.encode_cursor(tuple(getattr(last, key.key) for key in keys)),
+            )
+
+        return self.exec_(stmt, callback=callback, primary=primary)
+
+    def register_query(self, name: str, stmt) -> None:
+        """Register a named, parameterized query. The statement is built once and its
+        compiled form is kept in :attr:`compiled_cache`.
+
+        :param name: Name to execute the query by with :meth:`query`.
+        :param stmt: A statement whose parameters are ``bindparam`` s, for instance
+            ``select(User).where(User.userId == bindparam("userId"))``.
+        """
+
+        self.queries[name] = stmt
+        self.queries_calls[name] = 0
+
+    def register_queries(self) -> None:
+        """Register the hot lookups."""
+
+        self.register_query(
+            "user_by_user_id", select(User).where(User.userId == bindparam("userId"))
+        )
+        self.register_query(
+            "permissions_by_issuer",
+            select(Permission).where(
+                Permission.idUsersIssuedBy == bindparam("idUsersIssuedBy")
+            ),
+        )
+        self.register_query(
+            "permissions_by_grantee",
+            select(Permission).where(
+                Permission.idUsersIssuedTo == bindparam("idUsersIssuedTo")
+            ),
+        )
+        self.register_query(
+            "permissions_by_issuer_and_grantee",
+            select(Permission).where(
+                Permission.idUsersIssuedBy == bindparam("idUsersIssuedBy"),
+                Permission.idUsersIssuedTo == bindparam("idUsersIssuedTo"),
+            ),
+        )
+
+    def query(self, name: str, primary: bool = False, **params) -> Tuple:
+        """Execute a named query with bound ``params`` on a replica, or the primary when
+        ``primary`` is set.
+
+        :returns: The scalars of the results, like :meth:`scalars`.
+        """
+
+        stmt = self.queries[name]
+        self.queries_calls[name] += 1
+
+        with self.reader(primary)() as session:
+            results = session.execute(
+                stmt, params, execution_options={"compiled_cache": self.compiled_cache}
+            )
+            return tuple(results.scalars())
+
+    def query_cache_info(self) -> Dict[str, Any]:
+        """Statistics for the named queries and their compiled statement cache."""
+
+        lookups = self.compiled_cache.hits + self.compiled_cache.misses
+        return {
+            "hits": self.compiled_cache.hits,
+            "misses": self.compiled_cache.misses,
+            "hit_rate": self.compiled_cache.hits / lookups if lookups else None,
+            "size": len(self.compiled_cache),
+            "calls": dict(self.queries_calls),
+        }
+
+    def upsert(
+        self,
+        table: Table,
+        rows: List[Dict[str, Any]],
+        index_elements: Tuple[str, ...],
+        columns: Optional[Tuple[str, ...]] = None,
+    ):
+        """Create a multi-row insert of ``rows`` that updates the rows whose unique key
+        ``index_elements`` already exists.
+
+        This is ``INSERT ... ON DUPLICATE KEY UPDATE`` for MySQL and
+        ``INSERT ... ON CONFLICT DO UPDATE`` for SQLite.
+
+        :param columns: The columns to update. Defaults to every column of ``rows``
+            that is not in ``index_elements``.
+        """
+
+        columns = (
+            columns
+            if columns is not None
+            else tuple(key for key in rows[0] if key not in index_elements)
         )
+        match self.engine.dialect.name:
+            case "mysql":
+                stmt = mysql.insert(table).values(rows)
+                return stmt.on_duplicate_key_update(
+                    {column: stmt.inserted[column] for column in columns}
+                )
+            case "sqlite":
+                stmt = sqlite.insert(table).values(rows)
+                return stmt.on_conflict_do_update(
+                    index_elements=index_elements,
+                    set_={column: stmt.excluded[column] for column in columns},
+                )
+            case _:
+                logging.fatal(f"Upsert is undefined for `{self.engine.dialect.name}`.")
+                raise Exception(
+                    f"Upsert is undefined for `{self.engine.dialect.name}`."
+                )
 
     def create_tables(self) -> None:
         """Instantiate orm registry tables."""
@@ -236,15 +566,33 @@ class User(Database.Base):
     __tablename__ = "wtsettings_users"
 
     idUsers = Column(Integer, primary_key=True)
-    userId = Column(String(16), nullable=False, default=lambda: token_urlsafe(16))
+    userId = Column(
+        String(16), nullable=False, default=lambda: secrets.token_urlsafe(12)
+    )
     userName = Column(String(32), nullable=False)
     userAlias = Column(String(32), nullable=True)
     userCreated = Column(DateTime, default=date.today)
     userDetails = Column(String(32), nullable=True)
 
 
+class PermissionFlags(NamedTuple):
+    """The flags of a permission, see :meth:`Permission.grant`."""
+
+    userIssuedToCanRead: bool = True
+    userIssuedToCanWrite: bool = False
+    userIssuedToIsAdmin: bool = False
+
+
+class PermissionCounts(NamedTuple):
+    """Rows affected by :meth:`Permission.grant`."""
+
+    inserted: int
+    updated: int
+
+
 class Permission(Database.Base):
-    """Table to facilitate permisisons on collections.
+    """Table to facilitate permisisons on collections. There is at most one permission
+    for each issuer and grantee.
 
     :attr idPermissions: Primary key.
     :attr permissionId: Permission public id.
@@ -256,14 +604,17 @@ class Permission(Database.Base):
     """
 
     __tablename__ = "wtsettings_permissions"
+    __table_args__ = (UniqueConstraint("idUsersIssuedBy", "idUsersIssuedTo"),)
 
     idPermissions = Column(Integer, primary_key=True)
-    permissionId = Column(String(16), nullable=False, default=lambda: token_urlsafe(16))
+    permissionId = Column(
+        String(16), nullable=False, default=lambda: secrets.token_urlsafe(12)
+    )
     idUsersIssuedBy = Column(
-        Integer, ForeignKey("wtsettings_users.idUsers"), primary_key=True
+        Integer, ForeignKey("wtsettings_users.idUsers"), nullable=False
     )
     idUsersIssuedTo = Column(
-        Integer, ForeignKey("wtsettings_users.idUsers"), primary_key=True
+        Integer, ForeignKey("wtsettings_users.idUsers"), nullable=False
     )
     userIssuedToCanWrite = Column(Boolean)
     userIssuedToCanRead = Column(Boolean)
@@ -271,6 +622,231 @@ class Permission(Database.Base):
     permissionCreated = Column(DateTime, default=date.today)
     permissionLastUpdated = Column(DateTime, default=date.today)
 
+    @classmethod
+    def grant(
+        cls,
+        database: Database,
+        idUsersIssuedBy: int,
+        grantees: Union[Iterable[int], Dict[int, PermissionFlags]],
+        flags: PermissionFlags = PermissionFlags(),
+        batch_size: int = 500,
+    ) -> PermissionCounts:
+        """Grant permissions from one issuer to many grantees in one transaction.
+
+        For each batch of grantees the existing permissions are updated with one
+        ``UPDATE ... IN`` per set of flags, which counts them, and then every grantee
+        of the batch is written with one multi-row upsert. The upsert inserts the
+        missing permissions and, as it does not fail on the unique issuer and grantee,
+        also those a concurrent grant inserted in between.
+
+        :param database: The database to write to.
+        :param idUsersIssuedBy: The issuer.
+        :param grantees: The grantees, or a mapping of grantees to their flags.
+        :param flags: The flags of the grantees when ``grantees`` is not a mapping.
+        :param batch_size: Maximum number of grantees per statement.
+        :returns: The number of permissions inserted and updated.
+        """
+
+        grantees = (
+            {
+                grantee: PermissionFlags(*grantee_flags)
+                for grantee, grantee_flags in grantees.items()
+            }
+            if isinstance(grantees, dict)
+            else dict.fromkeys(grantees, PermissionFlags(*flags))
+        )
+        items = tuple(grantees.items())
+        now = datetime.now()
+        table = cls.__table__
+
+        inserted = updated = 0
+        with database.sessionmaker() as session:
+            for start in range(0, len(items), batch_size):
+                batch = items[start : start + batch_size]
+
+                groups: Dict[PermissionFlags, List[int]] = {}
+                for grantee, grantee_flags in batch:
+                    groups.setdefault(grantee_flags, []).append(grantee)
+
+                # The dialects report matched rather than changed rows.
+                batch_updated = 0
+                for grantee_flags, group in groups.items():
+                    batch_updated += session.execute(
+                        update(table)
+                        .where(
+                            table.c.idUsersIssuedBy == idUsersIssuedBy,
+                            table.c.idUsersIssuedTo.in_(group),
+                        )
+                        .values(permissionLastUpdated=now, **grantee_flags._asdict())
+                    ).rowcount
+
+                if batch_updated < len(batch):
+                    session.execute(
+                        database.upsert(
+                            table,
+                            [
+                                {
+                                    "permissionId": secrets.token_urlsafe(12),
+                                    "idUsersIssuedBy": idUsersIssuedBy,
+                                    "idUsersIssuedTo": grantee,
+                                    "permissionCreated": now,
+                                    "permissionLastUpdated": now,
+                                    **grantee_flags._asdict(),
+                                }
+                                for grantee, grantee_flags in batch
+                            ],
+                            ("idUsersIssuedBy", "idUsersIssuedTo"),
+                            ("permissionLastUpdated", *PermissionFlags._fields),
+                        )
+                    )
+
+                updated += batch_updated
+                inserted += len(batch) - batch_updated
+
+            session.commit()
+
+        logging.info(
+            f"User `{idUsersIssuedBy}` granted {inserted} new and {updated} updated "
+            "permissions."
+        )
+        return PermissionCounts(inserted, updated)
+
+    @classmethod
+    def revoke(
+        cls,
+        database: Database,
+        idUsersIssuedBy: int,
+        grantees: Iterable[int],
+        batch_size: int = 500,
+    ) -> int:
+        """Revoke the permissions issued by one issuer to many grantees in one
+        transaction.
+
+        :returns: The number of permissions deleted.
+        """
+
+        idUsersIssuedTo = tuple(grantees)
+        deleted = 0
+        with database.sessionmaker() as session:
+            for start in range(0, len(idUsersIssuedTo), batch_size):
+                deleted += session.execute(
+                    delete(cls.__table__).where(
+                        cls.__table__.c.idUsersIssuedBy == idUsersIssuedBy,
+                        cls.__table__.c.idUsersIssuedTo.in_(
+                            idUsersIssuedTo[start : start + batch_size]
+                        ),
+                    )
+                ).rowcount
+            session.commit()
+
+        logging.info(f"User `{idUsersIssuedBy}` revoked {deleted} permissions.")
+        return deleted
+
+
+class Action(Database.Base):
+    """An action of a users settings, see ``schemas.Action``.
+
+    :attr idActions: Primary key.
+    :attr idUsers: Who owns the action.
+    :attr actionSubsection: The subsection of the store containing the action.
+    :attr actionKeys: The keys to press to call the action.
+    :attr actionCommand: The string or dictionary for the command.
+    """
+
+    __tablename__ = "wtsettings_actions"
+    __table_args__ = (UniqueConstraint("idUsers", "actionSubsection", "actionKeys"),)
+
+    idActions = Column(Integer, primary_key=True)
+    idUsers = Column(Integer, ForeignKey("wtsettings_users.idUsers"), nullable=False)
+    actionSubsection = Column(String(32), nullable=False)
+    actionKeys = Column(String(64), nullable=False)
+    actionCommand = Column(JSON, nullable=False)
+
+
+class Scheme(Database.Base):
+    """A colorscheme of a users settings, see ``schemas.Scheme``.
+
+    :attr idSchemes: Primary key.
+    :attr idUsers: Who owns the scheme.
+    :attr schemeName: Name of the scheme.
+    :attr schemeContent: The scheme.
+    """
+
+    __tablename__ = "wtsettings_schemes"
+    __table_args__ = (UniqueConstraint("idUsers", "schemeName"),)
+
+    idSchemes = Column(Integer, primary_key=True)
+    idUsers = Column(Integer, ForeignKey("wtsettings_users.idUsers"), nullable=False)
+    schemeName = Column(String(64), nullable=False)
+    schemeContent = Column(JSON, nullable=False)
+
+
+class Profile(Database.Base):
+    """A profile of a users settings, see ``schemas.Profile``.
+
+    :attr idProfiles: Primary key.
+    :attr idUsers: Who owns the profile.
+    :attr profileGuid: The profile guid.
+    :attr profileContent: The profile.
+    """
+
+    __tablename__ = "wtsettings_profiles"
+    __table_args__ = (UniqueConstraint("idUsers", "profileGuid"),)
+
+    idProfiles = Column(Integer, primary_key=True)
+    idUsers = Column(Integer, ForeignKey("wtsettings_users.idUsers"), nullable=False)
+    profileGuid = Column(String(64), nullable=False)
+    profileContent = Column(JSON, nullable=False)
+
+
+class SettingsVersion(Database.Base):
+    """A version of the settings document of a user. Most versions are stored as a
+    delta from the previous version, see ``wtsettings.history``.
+
+    :attr idSettingsVersions: Primary key.
+    :attr idUsers: Who owns the settings.
+    :attr settingsVersion: Version number, counting from one for each user.
+    :attr settingsCreated: Datetime of the version.
+    :attr settingsIsSnapshot: Is ``settingsContent`` the full document or a delta.
+    :attr settingsContent: The full document or the delta from the previous version,
+        encoded as JSON text so that the order of keys is kept.
+    """
+
+    __tablename__ = "wtsettings_settings_versions"
+    __table_args__ = (
+        UniqueConstraint("idUsers", "settingsVersion"),
+        Index("idx_settings_versions_users_created", "idUsers", "settingsCreated"),
+    )
+
+    idSettingsVersions = Column(Integer, primary_key=True)
+    idUsers = Column(Integer, ForeignKey("wtsettings_users.idUsers"), nullable=False)
+    settingsVersion = Column(Integer, nullable=False)
+    settingsCreated = Column(DateTime, default=datetime.now, nullable=False)
+    settingsIsSnapshot = Column(Boolean, nullable=False)
+    settingsContent = Column(
+        Text().with_variant(mysql.MEDIUMTEXT(), "mysql"), nullable=False
+    )
+
+
+class Render(Database.Base):
+    """The windows terminal JSON rendered from the latest settings version of a user,
+    see ``wtsettings.render``.
+
+    :attr idUsers: Primary key, whose settings were rendered.
+    :attr renderVersion: The settings version that was rendered.
+    :attr renderContent: The rendered JSON.
+    :attr renderCreated: Datetime of rendering.
+    """
+
+    __tablename__ = "wtsettings_renders"
+
+    idUsers = Column(Integer, ForeignKey("wtsettings_users.idUsers"), primary_key=True)
+    renderVersion = Column(Integer, nullable=False)
+    renderContent = Column(
+        Text().with_variant(mysql.MEDIUMTEXT(), "mysql"), nullable=False
+    )
+    renderCreated = Column(DateTime, default=datetime.now, nullable=False)
+
 
 class Objects:
     """
@@ -287,6 +863,11 @@ class Objects:
             for item in (
                 User,
                 Permission,
+                Action,
+                Scheme,
+                Profile,
+                SettingsVersion,
+                Render,
             )
         }
         self.orderedtablenames = tuple(
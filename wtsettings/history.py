@@ -0,0 +1,326 @@
+"""Versioned history of the settings documents of users.
+
+Every ``snapshot_interval`` versions the full document is stored, the versions in
+between are stored as structural deltas from their previous version. Any version is
+rebuilt from the nearest snapshot before it by applying fewer than
+``snapshot_interval`` deltas.
+
+A delta is a list of operations, each of which is one of
+
+* ``["set", path, value]`` to set the key or index at ``path`` (appending to lists),
+* ``["del", path]`` to remove the key at ``path``,
+* ``["trunc", path, length]`` to truncate the list at ``path``,
+* ``["order", path, keys]`` to reorder the keys of the dict at ``path``.
+
+where ``path`` is a list of keys and indices from the root of the document. The order
+of keys matters, e.g. the order of ``actions`` is the order subsections are rendered
+in, so documents and deltas are stored as JSON text rather than in a JSON column, which
+MySQL normalizes.
+"""
+
+import copy
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, func, select
+
+from .database import Database, SettingsVersion, User
+
+Delta = List[List[Any]]
+
+
+def diff(old: Any, new: Any, path: Tuple = ()) -> Delta:
+    """Compute the delta taking ``old`` to ``new``."""
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        delta: Delta = [["del", [*path, key]] for key in old if key not in new]
+        for key, value in new.items():
+            if key not in old:
+                delta.append(["set", [*path, key], value])
+            else:
+                delta.extend(diff(old[key], value, (*path, key)))
+
+        # Deleted keys are removed and added keys appended, anything else is a reorder.
+        order = [key for key in old if key in new]
+        order.extend(key for key in new if key not in old)
+        if order != list(new):
+            delta.append(["order", [*path], list(new)])
+        return delta
+
+    if isinstance(old, list) and isinstance(new, list):
+        delta = []
+        for index, (old_item, new_item) in enumerate(zip(old, new)):
+            delta.extend(diff(old_item, new_item, (*path, index)))
+        if len(new) < len(old):
+            delta.append(["trunc", [*path], len(new)])
+        for index in range(len(old), len(new)):
+            delta.append(["set", [*path, index], new[index]])
+        return delta
+
+    # Compare types too, since ``True == 1`` and ``1.0 == 1``.
+    return [] if type(old) is type(new) and old == new else [["set", [*path], new]]
+
+
+def apply(document: Any, delta: Delta) -> Any:
+    """Apply ``delta`` to ``document`` in place. The root is returned since a delta
+    may replace it.
+    """
+
+    for operation, path, *args in delta:
+
+        if operation in ("trunc", "order"):
+            target = document
+            for key in path:
+                target = target[key]
+            if operation == "trunc":
+                del target[args[0] :]
+            else:
+                items = {key: target[key] for key in args[0]}
+                target.clear()
+                target.update(items)
+            continue
+
+        if not path:
+            if operation != "set":
+                raise Exception(f"Operation `{operation}` requires a nonempty path.")
+            document = copy.deepcopy(args[0])
+            continue
+
+        parent = document
+        for key in path[:-1]:
+            parent = parent[key]
+
+        key = path[-1]
+        match operation:
+            case "set" if isinstance(parent, list) and key == len(parent):
+                parent.append(copy.deepcopy(args[0]))
+            case "set":
+                parent[key] = copy.deepcopy(args[0])
+            case "del":
+                del parent[key]
+            case _:
+                raise Exception(f"Undefined delta operation `{operation}`.")
+
+    return document
+
+
+def rebuild(contents: Iterable[str]) -> Any:
+    """Rebuild a document from the stored contents of a snapshot and the deltas after
+    it, in order.
+    """
+
+    contents = iter(contents)
+    # The content is freshly decoded, so it is safe to apply deltas in place.
+    document = json.loads(next(contents))
+    for content in contents:
+        document = apply(document, json.loads(content))
+
+    return document
+
+
+def patch(document: Any, delta: Delta) -> Any:
+    """Apply ``delta`` to a copy of ``document``."""
+
+    return apply(copy.deepcopy(document), delta)
+
+
+class History:
+    """Versioned settings documents stored in ``wtsettings_settings_versions``.
+
+    :attr database: The database to store versions in.
+    :attr snapshot_interval: Store the full document every this many versions. This
+        bounds the number of deltas applied by :meth:`checkout`.
+    """
+
+    def __init__(self, database: Database, snapshot_interval: int = 16):
+
+        if snapshot_interval < 1:
+            raise Exception("`snapshot_interval` must be positive.")
+
+        self.database = database
+        self.snapshot_interval = snapshot_interval
+
+    @staticmethod
+    def select_latest(idUsers: int):
+
+        return select(func.max(SettingsVersion.settingsVersion)).where(
+            SettingsVersion.idUsers == idUsers
+        )
+
+    @staticmethod
+    def select_rebuild(idUsers: int, version: int):
+        """Select the rows to rebuild ``version`` from, its snapshot and the deltas
+        after it, in order.
+        """
+
+        snapshot = (
+            select(func.max(SettingsVersion.settingsVersion))
+            .where(
+                SettingsVersion.idUsers == idUsers,
+                SettingsVersion.settingsVersion <= version,
+                SettingsVersion.settingsIsSnapshot,
+            )
+            .scalar_subquery()
+        )
+        return (
+            select(SettingsVersion)
+            .where(
+                SettingsVersion.idUsers == idUsers,
+                SettingsVersion.settingsVersion >= snapshot,
+                SettingsVersion.settingsVersion <= version,
+            )
+            .order_by(SettingsVersion.settingsVersion)
+        )
+
+    def latest(self, idUsers: int, primary: bool = False) -> Optional[int]:
+        """The latest version for ``idUsers``, ``None`` when there are none."""
+
+        (version,) = self.database.scalars(self.select_latest(idUsers), primary=primary)
+        return version
+
+    def checkout(
+        self, idUsers: int, version: Optional[int] = None, primary: bool = False
+    ) -> Dict:
+        """Rebuild a version of the settings of ``idUsers``.
+
+        :param version: The version to rebuild. Defaults to the latest version.
+        :param primary: Read from the primary instead of a replica.
+        :returns: The settings document.
+        """
+
+        version = version if version is not None else self.latest(idUsers, primary)
+        if version is None:
+            raise Exception(f"User `{idUsers}` has no settings versions.")
+
+        rows = self.database.scalars(
+            self.select_rebuild(idUsers, version), primary=primary
+        )
+        if not rows or rows[-1].settingsVersion != version:
+            raise Exception(f"User `{idUsers}` has no settings version `{version}`.")
+
+        return rebuild(row.settingsContent for row in rows)
+
+    def latest_contents(
+        self, idUsers: Sequence[int], primary: bool = False
+    ) -> Dict[int, Tuple[int, Tuple[str, ...]]]:
+        """Read what is needed to rebuild the latest version of each of ``idUsers`` in
+        one query, e.g. to rebuild them elsewhere with :func:`rebuild`.
+
+        :param primary: Read from the primary instead of a replica.
+        :returns: The latest version and the stored contents of its snapshot and the
+            deltas after it, in order, for each user with settings versions.
+        """
+
+        snapshots = (
+            select(
+                SettingsVersion.idUsers,
+                func.max(SettingsVersion.settingsVersion).label("settingsVersion"),
+            )
+            .where(
+                SettingsVersion.idUsers.in_(idUsers),
+                SettingsVersion.settingsIsSnapshot,
+            )
+            .group_by(SettingsVersion.idUsers)
+            .subquery()
+        )
+        rows = self.database.exec_(
+            select(
+                SettingsVersion.idUsers,
+                SettingsVersion.settingsVersion,
+                SettingsVersion.settingsContent,
+            )
+            .join(
+                snapshots,
+                and_(
+                    SettingsVersion.idUsers == snapshots.c.idUsers,
+                    SettingsVersion.settingsVersion >= snapshots.c.settingsVersion,
+                ),
+            )
+            .order_by(SettingsVersion.idUsers, SettingsVersion.settingsVersion),
+            callback=lambda results: results.all(),
+            primary=primary,
+        )
+
+        contents: Dict[int, List[str]] = {}
+        latest: Dict[int, int] = {}
+        for user, version, content in rows:
+            contents.setdefault(user, []).append(content)
+            latest[user] = version
+
+        return {user: (latest[user], tuple(items)) for user, items in contents.items()}
+
+    def commit(self, idUsers: int, document: Dict) -> int:
+        """Store ``document`` as the next version of the settings of ``idUsers``.
+
+        The latest version is read, diffed against and followed in one transaction on
+        the primary, with the row of the user locked by ``SELECT ... FOR UPDATE``.
+
+        :param document: The settings document, e.g. ``WTSettingsYAMLSchema(...).dict()``.
+        :returns: The new version.
+        """
+
+        with self.database.sessionmaker() as session:
+
+            # Lock the user until the commit, so that concurrent commits for the user
+            # are serialized and each delta is from the version it follows. SQLite
+            # ignores the lock, but serializes the inserts, and the unique user and
+            # version then rejects the later of two racing commits.
+            session.execute(
+                select(User.idUsers).where(User.idUsers == idUsers).with_for_update()
+            )
+            latest = session.execute(self.select_latest(idUsers)).scalar()
+            version = 1 if latest is None else latest + 1
+
+            content: Any = document
+            is_snapshot = (version - 1) % self.snapshot_interval == 0
+            if not is_snapshot:
+                rows = session.execute(self.select_rebuild(idUsers, latest)).scalars()
+                delta = diff(rebuild(row.settingsContent for row in rows), document)
+
+                # Store a snapshot when the delta is no smaller.
+                if len(json.dumps(delta)) < len(json.dumps(document)):
+                    content = delta
+                else:
+                    is_snapshot = True
+
+            session.add(
+                SettingsVersion(
+                    idUsers=idUsers,
+                    settingsVersion=version,
+                    settingsIsSnapshot=is_snapshot,
+                    settingsContent=json.dumps(content),
+                )
+            )
+            session.commit()
+
+        logging.info(f"Committed settings version `{version}` for user `{idUsers}`.")
+        return version
+
+    def rollback(self, idUsers: int, version: int) -> int:
+        """Commit the content of ``version`` as the next version.
+
+        :returns: The new version.
+        """
+
+        return self.commit(idUsers, self.checkout(idUsers, version, primary=True))
+
+    def versions(self, idUsers: int, primary: bool = False) -> Tuple[Dict, ...]:
+        """List the versions of the settings of ``idUsers`` by creation time, without
+        their content.
+
+        :param primary: Read from the primary instead of a replica, e.g. right after
+            :meth:`commit`.
+        """
+
+        return self.database.exec_(
+            select(
+                SettingsVersion.settingsVersion,
+                SettingsVersion.settingsCreated,
+                SettingsVersion.settingsIsSnapshot,
+            )
+            .where(SettingsVersion.idUsers == idUsers)
+            .order_by(SettingsVersion.settingsCreated, SettingsVersion.settingsVersion),
+            callback=lambda results: tuple(dict(row) for row in results.mappings()),
+            primary=primary,
+        )
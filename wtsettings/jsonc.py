@@ -0,0 +1,213 @@
+"""A reader and writer for JSON with comments, the dialect of the windows terminal
+``settings.json``.
+
+The fast path (:func:`loads`) removes comments and trailing commas with a single
+compiled regular expression, so the scan is done in C in one linear pass, and hands
+the result to the stdlib JSON decoder. When comments must survive a round trip use
+:func:`loads_document`, which additionally anchors every comment to the key or
+element that it precedes so that :func:`dumps` can write them back.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+Path = Tuple[Union[str, int], ...]
+
+_STRING = r'"(?:[^"\\]|\\.)*"'
+_COMMENT = r"//[^\n]*|/\*[\s\S]*?\*/"
+
+# Strings are captured and put back, comments and trailing commas are matched outside
+# of any capture group and so are replaced with nothing.
+_STRIP = re.compile(
+    rf"({_STRING})|{_COMMENT}|,(?=(?:\s|{_COMMENT})*[}}\]])",
+)
+
+# Tokens used when comments are collected: strings, comments, structural characters
+# and scalars (numbers, ``true``, ``false`` and ``null``). Everything else is whitespace.
+_TOKENS = re.compile(rf"({_STRING})|({_COMMENT})|([{{}}\[\]:,])|([^\s{{}}\[\]:,\"/]+)")
+
+
+class Comment(NamedTuple):
+    """A comment from a JSONC document.
+
+    :attr path: Path of the key or element the comment precedes. For comments that
+        precede the closing bracket of a container this is the path of the container.
+    :attr text: The raw comment including its delimiters.
+    :attr offset: Offset of the comment in the source document.
+    :attr trailing: Does the comment precede the closing bracket of the container.
+    """
+
+    path: Path
+    text: str
+    offset: int
+    trailing: bool = False
+
+
+class Document(NamedTuple):
+    """A decoded JSONC document and its comments."""
+
+    data: Any
+    comments: Tuple[Comment, ...]
+
+
+def strip(text: str) -> str:
+    """Remove comments and trailing commas from ``text``."""
+
+    return _STRIP.sub(r"\1", text)
+
+
+def loads(text: Union[str, bytes]) -> Any:
+    """Decode a JSONC document, discarding comments."""
+
+    if isinstance(text, bytes):
+        text = text.decode("utf-8-sig")
+
+    return json.loads(strip(text))
+
+
+def load(filepath: str) -> Any:
+    """Decode the JSONC document at ``filepath``, discarding comments."""
+
+    with open(filepath, "rb") as file:
+        return loads(file.read())
+
+
+def _comments(text: str) -> Tuple[Comment, ...]:
+    """Collect the comments of ``text`` and anchor them to the following key or
+    element.
+
+    Containers are tracked as ``[path, next_index_or_key, expecting_key]`` so that
+    comments can be attached to the next key of an object or the next element of an
+    array.
+    """
+
+    stack: List[List[Any]] = []
+    pending: List[Tuple[str, int]] = []
+    comments: List[Comment] = []
+
+    def flush(path: Path, trailing: bool = False) -> None:
+        comments.extend(
+            Comment(path, raw, offset, trailing) for raw, offset in pending
+        )
+        pending.clear()
+
+    def anchor_value() -> None:
+        # A value is starting in the current container, at the current index of an
+        # array or after the current key of an object.
+        if not pending or not stack:
+            return
+        container_path, index, expecting_key = stack[-1]
+        if index is not None and not expecting_key:
+            flush((*container_path, index))
+
+    for match in _TOKENS.finditer(text):
+        string, comment, char, scalar = match.groups()
+
+        if comment is not None:
+            pending.append((comment, match.start()))
+        elif string is not None:
+            if stack and stack[-1][2]:
+                # This string is a key.
+                stack[-1][1] = json.loads(string)
+                stack[-1][2] = False
+                flush((*stack[-1][0], stack[-1][1]))
+            else:
+                anchor_value()
+        elif scalar is not None:
+            anchor_value()
+        elif char in "{[":
+            anchor_value()
+            parent = stack[-1] if stack else None
+            path: Path = () if parent is None else (*parent[0], parent[1])
+            stack.append([path, 0 if char == "[" else None, char == "{"])
+        elif char in "}]":
+            container = stack.pop()
+            if pending:
+                flush(container[0], trailing=True)
+        elif char == ",":
+            if isinstance(stack[-1][1], int):
+                stack[-1][1] += 1
+            else:
+                stack[-1][2] = True
+
+    # Comments at the end of the document belong to the root.
+    flush((), trailing=True)
+    return tuple(comments)
+
+
+def loads_document(text: Union[str, bytes]) -> Document:
+    """Decode a JSONC document and keep its comments for :func:`dumps`."""
+
+    if isinstance(text, bytes):
+        text = text.decode("utf-8-sig")
+
+    return Document(json.loads(strip(text)), _comments(text))
+
+
+def load_document(filepath: str) -> Document:
+    """Decode the JSONC document at ``filepath`` and keep its comments."""
+
+    with open(filepath, "rb") as file:
+        return loads_document(file.read())
+
+
+def dumps(
+    data: Any,
+    comments: Optional[Tuple[Comment, ...]] = None,
+    indent: int = 4,
+) -> str:
+    """Encode ``data`` as JSONC, writing ``comments`` before the keys and elements
+    they are anchored to.
+
+    Comments anchored to paths that no longer exist in ``data`` are dropped.
+    """
+
+    if not comments:
+        return json.dumps(data, indent=indent)
+
+    leading: Dict[Path, List[str]] = {}
+    trailing: Dict[Path, List[str]] = {}
+    for comment in comments:
+        (trailing if comment.trailing else leading).setdefault(
+            comment.path, []
+        ).append(comment.text)
+
+    lines: List[str] = []
+
+    def write_comments(texts: List[str], depth: int) -> None:
+        pad = " " * (indent * depth)
+        lines.extend(pad + line.strip() for text in texts for line in text.splitlines())
+
+    def encode(value: Any, path: Path, depth: int, prefix: str, suffix: str) -> None:
+        pad = " " * (indent * depth)
+        if isinstance(value, dict) and value:
+            items = tuple(value.items())
+            children = (((*path, key), json.dumps(key) + ": ", item) for key, item in items)
+            brackets = "{}"
+        elif isinstance(value, list) and value:
+            items = tuple(enumerate(value))
+            children = (((*path, index), "", item) for index, item in items)
+            brackets = "[]"
+        elif isinstance(value, (dict, list)) and path in trailing:
+            # An empty container keeps the comments written inside it.
+            lines.append(pad + prefix + json.dumps(value)[0])
+            write_comments(trailing[path], depth + 1)
+            lines.append(pad + json.dumps(value)[1] + suffix)
+            return
+        else:
+            lines.append(pad + prefix + json.dumps(value) + suffix)
+            if not path:
+                write_comments(trailing.get((), []), 0)
+            return
+
+        lines.append(pad + prefix + brackets[0])
+        for position, (child_path, child_prefix, child) in enumerate(children):
+            write_comments(leading.get(child_path, []), depth + 1)
+            child_suffix = "," if position < len(items) - 1 else ""
+            encode(child, child_path, depth + 1, child_prefix, child_suffix)
+        write_comments(trailing.get(path, []), depth + 1)
+        lines.append(pad + brackets[1] + suffix)
+
+    encode(data, (), 0, "", "")
+    return "\n".join(lines) + "\n"
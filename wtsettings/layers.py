@@ -0,0 +1,230 @@
+"""Layered YAML stores: a base store and ordered overlays.
+
+Overlays are merged onto the base per subsection and per key chord, so an action of an
+overlay replaces the action of the same subsection with the same ``keys`` and new
+chords are appended. An action whose ``command`` is ``null`` removes the chord and a
+subsection that is ``null`` removes the subsection. Any other top level field of an
+overlay, e.g. ``profiles``, replaces that of the layers below it.
+
+Each layer is compiled (parsed and indexed by chord) once and cached by the digest of
+its content. Each merge is cached by the digests of the layers up to and including it,
+so changing one overlay only remerges that overlay and those after it. Both caches are
+kept in memory and, when a ``RenderCache`` is given, on disk as JSON.
+"""
+
+import copy
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import yaml
+from pydantic import BaseModel
+
+from .cache import RenderCache
+from .profiling import profiler
+
+Compiled = Dict[str, Any]
+
+
+class Layer(BaseModel):
+    """How a layer should look. Unlike a store, actions and subsections may be
+    ``null`` to remove them.
+    """
+
+    class Action(BaseModel):
+
+        keys: str
+        command: Optional[Union[str, Dict]]
+
+    actions: Optional[Dict[str, Optional[List[Action]]]] = None
+
+
+def compile_layer(content: bytes) -> Compiled:
+    """Parse a store and index its actions by subsection and chord.
+
+    :returns: The store with ``actions`` mapping subsections to chords to actions.
+        Removed chords and subsections are ``None``.
+    :raises pydantic.ValidationError: When the layer is malformed, e.g. an action has
+        no ``keys`` or a subsection is not a list.
+    """
+
+    data = yaml.safe_load(content) or {}
+    actions = Layer.parse_obj(data).dict()["actions"] or {}
+
+    # Index the validated actions and pass the other fields through JSON, so that a
+    # layer has the same types whether it is compiled or read from the disk cache.
+    others = {key: value for key, value in data.items() if key != "actions"}
+    others = json.loads(json.dumps(others, default=str))
+    return {
+        **others,
+        "actions": {
+            subsection_name: (
+                None
+                if subsection is None
+                else {
+                    action["keys"]: None if action["command"] is None else action
+                    for action in subsection
+                }
+            )
+            for subsection_name, subsection in actions.items()
+        },
+    }
+
+
+def merge_layers(base: Compiled, overlay: Compiled) -> Compiled:
+    """Merge ``overlay`` onto ``base``. Neither is modified."""
+
+    actions = dict(base["actions"])
+    for subsection_name, chords in overlay["actions"].items():
+        if chords is None:
+            actions.pop(subsection_name, None)
+            continue
+
+        merged = dict(actions.get(subsection_name) or {})
+        for keys, action in chords.items():
+            if action is None:
+                merged.pop(keys, None)
+            else:
+                merged[keys] = action
+        actions[subsection_name] = merged
+
+    return {**base, **overlay, "actions": actions}
+
+
+def document(compiled: Compiled) -> Dict[str, Any]:
+    """Turn a compiled layer back into a store document. The document is a copy, so
+    that changing it does not change the cached layers.
+    """
+
+    return copy.deepcopy(
+        {
+            **compiled,
+            "actions": {
+                subsection_name: [
+                    action for action in chords.values() if action is not None
+                ]
+                for subsection_name, chords in compiled["actions"].items()
+                if chords is not None
+            },
+        }
+    )
+
+
+class LayeredStore:
+    """Loads layered stores, caching compiled and merged layers.
+
+    :attr max_entries: Bound on the number of compiled and merged layers kept in memory.
+    :attr memo: Compiled and merged layers in memory, least recently used first.
+    """
+
+    def __init__(self, max_entries: int = 64):
+
+        self.max_entries = max_entries
+        self.memo: OrderedDict[str, Compiled] = OrderedDict()
+
+    @staticmethod
+    def digest(contents: Sequence[bytes]) -> Tuple[str, ...]:
+
+        return tuple(hashlib.sha256(content).hexdigest() for content in contents)
+
+    def lookup(self, key: str, cache: Optional[RenderCache]) -> Optional[Compiled]:
+
+        compiled = self.memo.get(key)
+        if compiled is not None:
+            self.memo.move_to_end(key)
+            return compiled
+
+        content = cache.get(key) if cache is not None else None
+        if content is None:
+            return None
+
+        compiled = json.loads(content)
+        self.remember(key, compiled, None)
+        return compiled
+
+    def remember(
+        self, key: str, compiled: Compiled, cache: Optional[RenderCache]
+    ) -> None:
+
+        self.memo[key] = compiled
+        self.memo.move_to_end(key)
+        while len(self.memo) > self.max_entries:
+            self.memo.popitem(last=False)
+
+        if cache is not None:
+            cache.put(key, json.dumps(compiled))
+
+    def get(
+        self,
+        key: str,
+        build: Callable[[], Compiled],
+        cache: Optional[RenderCache],
+    ) -> Compiled:
+
+        compiled = self.lookup(key, cache)
+        if compiled is None:
+            compiled = build()
+            self.remember(key, compiled, cache)
+
+        return compiled
+
+    def load(
+        self, filepaths: Sequence[str], cache: Optional[RenderCache] = None
+    ) -> Dict[str, Any]:
+        """Load the base store ``filepaths[0]`` with the overlays ``filepaths[1:]``.
+
+        :param filepaths: Paths of the base and the overlays in the order to apply them.
+        :param cache: Optional on-disk cache for compiled and merged layers.
+        :returns: The merged store document.
+        """
+
+        contents = []
+        for filepath in filepaths:
+            with open(filepath, "rb") as file:
+                contents.append(file.read())
+
+        return self.load_contents(contents, cache)
+
+    def load_contents(
+        self, contents: Sequence[bytes], cache: Optional[RenderCache] = None
+    ) -> Dict[str, Any]:
+        """Like :meth:`load`, but from the contents of the base and the overlays."""
+
+        # The merge of the base alone is the compiled base.
+        digests = self.digest(contents)
+        keys = (RenderCache.key("layer", digests[0]),) + tuple(
+            RenderCache.key("layers", *digests[: index + 1])
+            for index in range(1, len(digests))
+        )
+
+        # Start from the longest merge that is already cached.
+        merged: Optional[Compiled] = None
+        start = 0
+        for index in reversed(range(len(keys))):
+            merged = self.lookup(keys[index], cache)
+            if merged is not None:
+                start = index + 1
+                break
+
+        for index in range(start, len(keys)):
+            with profiler.phase("parse"):
+                layer = self.get(
+                    RenderCache.key("layer", digests[index]),
+                    lambda: compile_layer(contents[index]),
+                    cache,
+                )
+
+            if merged is None:
+                merged = layer
+                continue
+
+            with profiler.phase("merge"):
+                merged = self.get(
+                    keys[index], lambda: merge_layers(merged, layer), cache
+                )
+
+        return document(merged)
+
+
+store = LayeredStore()
@@ -0,0 +1,109 @@
+"""Per phase timing for the ``wtsettings`` command, see ``--profile``.
+
+Phases are timed with ``time.perf_counter``. Time spent waiting for the user, the
+``input`` phase, is reported but left out of the total. When profiling is disabled
+:meth:`Profiler.phase` returns a shared no-op context manager, so the instrumentation
+costs almost nothing.
+"""
+
+import cProfile
+import json
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from os import path
+from typing import Dict, List, Optional
+
+_NULL = nullcontext()
+
+
+class Profiler:
+    """Collects the time spent in each phase.
+
+    :attr created: ``perf_counter`` at creation, which is when ``wtsettings`` is first
+        imported.
+    :attr enabled: Are phases timed.
+    :attr dump_directory: When set, each phase is also run under ``cProfile`` and its
+        stats are dumped to ``<dump_directory>/<phase>.pstats``.
+    :attr timings: Durations of each call of each phase in seconds.
+    :attr idle: Phases spent waiting rather than working, which are left out of the
+        total.
+    """
+
+    idle = ("input",)
+
+    def __init__(self):
+
+        self.created: float = time.perf_counter()
+        self.enabled: bool = False
+        self.dump_directory: Optional[str] = None
+        self.timings: Dict[str, List[float]] = {}
+        self.profiles: Dict[str, cProfile.Profile] = {}
+
+    def enable(self, dump_directory: Optional[str] = None) -> None:
+
+        self.enabled = True
+        self.dump_directory = dump_directory
+
+    def record(self, name: str, seconds: float) -> None:
+
+        self.timings.setdefault(name, []).append(seconds)
+
+    def phase(self, name: str):
+        """Time the enclosed block as part of phase ``name``."""
+
+        return self._phase(name) if self.enabled else _NULL
+
+    @contextmanager
+    def _phase(self, name: str):
+
+        profile = None
+        if self.dump_directory is not None:
+            profile = self.profiles.setdefault(name, cProfile.Profile())
+            profile.enable()
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+            if profile is not None:
+                profile.disable()
+
+    def dump(self) -> None:
+        """Write the ``cProfile`` stats of each phase."""
+
+        if self.dump_directory is None:
+            return
+
+        os.makedirs(self.dump_directory, exist_ok=True)
+        for name, profile in self.profiles.items():
+            profile.dump_stats(path.join(self.dump_directory, f"{name}.pstats"))
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+
+        return {
+            name: {"calls": len(timings), "seconds": sum(timings)}
+            for name, timings in self.timings.items()
+        }
+
+    def report(self, format: str = "table") -> str:
+        """Summarize the phases as a ``table`` or as ``json``."""
+
+        summary = self.summary()
+        idle = sum(summary[name]["seconds"] for name in self.idle if name in summary)
+        total = time.perf_counter() - self.created - idle
+        if format == "json":
+            return json.dumps({"phases": summary, "total": total}, indent=2)
+
+        rows = [f"{'phase':<12}{'calls':>8}{'ms':>12}{'%':>8}"]
+        for name, item in summary.items():
+            share = "" if name in self.idle else f"{100 * item['seconds'] / total:.1f}"
+            rows.append(
+                f"{name:<12}{item['calls']:>8}{1000 * item['seconds']:>12.3f}{share:>8}"
+            )
+        rows.append(f"{'total':<12}{'':>8}{1000 * total:>12.3f}{100:>8.1f}")
+        return "\n".join(rows)
+
+
+profiler = Profiler()
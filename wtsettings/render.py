@@ -0,0 +1,186 @@
+"""Render the windows terminal JSON of every user in bulk.
+
+Users are streamed from the database in pages and the stored contents of the latest
+settings of each page are read in one query. The settings are rebuilt from those
+contents and rendered in a process pool, so the parent process only reads, and the
+results are written back to ``wtsettings_renders`` in batched upserts. At most
+``max_in_flight`` renders are pending at once so that memory stays flat however many
+users there are.
+"""
+
+import logging
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import select
+
+from .database import Database, Render, User
+from .history import History, rebuild
+from .schemas import WTSettingsJSONSchema, WTSettingsYAMLSchema
+
+
+class RenderReport(NamedTuple):
+    """Outcome of :func:`render_users`.
+
+    :attr users: Number of users read.
+    :attr rendered: Number of users whose settings were rendered and written.
+    :attr failed: Number of users whose settings failed to render.
+    :attr skipped: Number of users without settings.
+    :attr seconds: Wall time of the run.
+    """
+
+    users: int
+    rendered: int
+    failed: int
+    skipped: int
+    seconds: float
+
+    @property
+    def throughput(self) -> float:
+        """Renders per second."""
+
+        return self.rendered / self.seconds if self.seconds else 0.0
+
+
+def render_document(document: Dict) -> str:
+    """Render a settings document, as stored by ``History``, to windows terminal JSON.
+
+    This runs in the worker processes, so it must stay importable at module level.
+    """
+
+    wtsettings = WTSettingsYAMLSchema.parse_obj(document)
+    return WTSettingsJSONSchema(
+        **wtsettings.dict(exclude={"actions"}),
+        actions=tuple(
+            action for subsection in wtsettings.actions.values() for action in subsection
+        ),
+    ).json(indent=4)
+
+
+def render_contents(contents: Sequence[str]) -> str:
+    """Rebuild a settings document from its stored contents, see
+    ``History.latest_contents``, and render it. This runs in the worker processes.
+    """
+
+    return render_document(rebuild(contents))
+
+
+def write_renders(database: Database, rows: List[Dict[str, Any]]) -> None:
+
+    with database.sessionmaker() as session:
+        session.execute(database.upsert(Render.__table__, rows, ("idUsers",)))
+        session.commit()
+
+
+def render_users(
+    database: Database,
+    history: Optional[History] = None,
+    chunk_size: int = 100,
+    max_workers: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> RenderReport:
+    """Rerender the latest settings version of every user.
+
+    :param database: The database to read users and settings from and write renders
+        to.
+    :param history: The settings history. Defaults to ``History(database)``.
+    :param chunk_size: Number of users per page read and rows per batch written.
+    :param max_workers: Number of worker processes.
+    :param max_in_flight: Maximum number of pending renders. Defaults to twice
+        ``chunk_size``.
+    :param executor: Executor to render with instead of a new process pool.
+    :returns: Counts and timing of the run.
+    """
+
+    history = history if history is not None else History(database)
+    max_in_flight = max_in_flight if max_in_flight is not None else 2 * chunk_size
+
+    start = time.monotonic()
+    users = rendered = failed = skipped = 0
+    pending: Dict[Future, Tuple[int, int]] = {}
+    batch: List[Dict[str, Any]] = []
+
+    def collect(done: Set[Future]) -> None:
+        nonlocal rendered, failed
+
+        for future in done:
+            idUsers, version = pending.pop(future)
+            try:
+                content = future.result()
+            except Exception as err:
+                failed += 1
+                logging.warning(f"Failed to render settings of user `{idUsers}`: {err}")
+                continue
+
+            batch.append(
+                {
+                    "idUsers": idUsers,
+                    "renderVersion": version,
+                    "renderContent": content,
+                    "renderCreated": datetime.now(),
+                }
+            )
+
+        if len(batch) >= chunk_size:
+            write_renders(database, batch)
+            rendered += len(batch)
+            batch.clear()
+
+    owns_executor = executor is None
+    executor = executor if executor is not None else ProcessPoolExecutor(max_workers)
+    try:
+        cursor: Optional[str] = None
+        while True:
+            page = database.paginate(
+                select(User),
+                (User.idUsers,),
+                cursor=cursor,
+                limit=chunk_size,
+                serializer=lambda user: user.idUsers,
+            )
+
+            latest = history.latest_contents(page.items) if page.items else {}
+            for idUsers in page.items:
+                users += 1
+                if idUsers not in latest:
+                    skipped += 1
+                    continue
+
+                version, contents = latest.pop(idUsers)
+                pending[executor.submit(render_contents, contents)] = (idUsers, version)
+
+                if len(pending) >= max_in_flight:
+                    done, _ = wait(tuple(pending), return_when=FIRST_COMPLETED)
+                    collect(done)
+
+            if (cursor := page.cursor) is None:
+                break
+
+        while pending:
+            done, _ = wait(tuple(pending), return_when=FIRST_COMPLETED)
+            collect(done)
+
+        if batch:
+            write_renders(database, batch)
+            rendered += len(batch)
+            batch.clear()
+    finally:
+        if owns_executor:
+            executor.shutdown()
+
+    report = RenderReport(users, rendered, failed, skipped, time.monotonic() - start)
+    logging.info(
+        f"Rendered {report.rendered} of {report.users} users, {report.failed} failed "
+        f"and {report.skipped} skipped, in {report.seconds:.2f}s "
+        f"({report.throughput:.1f}/s)."
+    )
+    return report
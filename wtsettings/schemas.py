@@ -4,6 +4,8 @@ from typing import Dict, List, Optional, Tuple, Union
 import yaml
 from pydantic import BaseModel, BaseSettings
 
+from . import jsonc
+
 
 class Config(BaseSettings):
     """Settings for interactive mode."""
@@ -57,7 +59,7 @@ class Scheme(BaseModel):
 class Profile(BaseModel):
     """A model for a profile object."""
 
-    class Font:
+    class Font(BaseModel):
         face: str
         size: int
 
@@ -90,17 +92,22 @@ class WTSettingsCommonSchema(BaseModel):
     copyOnSelect: bool
     defaultProfile: str
     profiles: Profiles
-    schemes: List[Schemes]
+    schemes: List[Scheme]
 
 
 class WTSettingsJSONSchema(WTSettingsCommonSchema):
     """A Json for the windows terminal schemas."""
 
+    @classmethod
     def load(cls, config: Optional[Config] = None) -> "WTSettingsJSONSchema":
+        """Load the windows terminal settings. Since these are JSON with comments they
+        are read with :func:`jsonc.load` instead of ``yaml``.
+        """
+
+        config = config or Config()
 
         filepath = config.JSONConfig
-        with open(filepath, "r") as file:
-            return cls(**yaml.safe_load(file))
+        return cls(**jsonc.load(filepath))
 
     actions: List[Action]
 
@@ -0,0 +1,202 @@
+"""Synchronize a parsed YAML store into the database.
+
+The store is compared with the rows of a user by natural key and only the difference
+is written, as batches of multi-row upserts and deletes. Syncing an unchanged store
+costs one select per table.
+"""
+
+import logging
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from .database import Action, Database, Profile, Scheme
+from .schemas import WTSettingsYAMLSchema
+
+Key = Tuple[Any, ...]
+
+
+class SyncCounts(NamedTuple):
+    """Rows written for one table."""
+
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+
+
+class SyncReport(NamedTuple):
+    """Rows written for each table by :func:`sync`."""
+
+    actions: SyncCounts
+    schemes: SyncCounts
+    profiles: SyncCounts
+
+    @property
+    def changed(self) -> bool:
+
+        return any(
+            counts.inserted or counts.updated or counts.deleted for counts in self
+        )
+
+
+def rows_actions(wtsettings: WTSettingsYAMLSchema) -> Dict[Key, Dict[str, Any]]:
+
+    return {
+        (subsection_name, action.keys): {"actionCommand": action.command}
+        for subsection_name, subsection in wtsettings.actions.items()
+        for action in subsection
+    }
+
+
+def rows_schemes(wtsettings: WTSettingsYAMLSchema) -> Dict[Key, Dict[str, Any]]:
+
+    # The store of the interactive mode may not have schemes or profiles.
+    return {
+        (scheme.name,): {"schemeContent": scheme.dict()}
+        for scheme in getattr(wtsettings, "schemes", None) or ()
+    }
+
+
+def rows_profiles(wtsettings: WTSettingsYAMLSchema) -> Dict[Key, Dict[str, Any]]:
+
+    profiles = getattr(wtsettings, "profiles", None)
+    return {
+        (profile.guid,): {"profileContent": profile.dict()}
+        for profile in (profiles.list if profiles is not None else ())
+    }
+
+
+def primary_key_name(model) -> str:
+
+    (column,) = model.__table__.primary_key.columns
+    return column.key
+
+
+def sync_table(
+    database: Database,
+    session: Session,
+    model,
+    key_columns: Tuple[str, ...],
+    idUsers: int,
+    rows: Dict[Key, Dict[str, Any]],
+    batch_size: int,
+) -> SyncCounts:
+    """Write the difference between ``rows`` and the rows of ``model`` owned by
+    ``idUsers``.
+
+    :param model: The mapped class to sync.
+    :param key_columns: Names of the columns of the natural key, excluding ``idUsers``.
+    :param rows: Value columns of the desired rows keyed by natural key.
+    :param batch_size: Maximum number of rows per statement.
+    """
+
+    primary_key = primary_key_name(model)
+    value_columns = tuple(next(iter(rows.values()), {}))
+    existing: Dict[Key, Tuple[Any, Dict[str, Any]]] = {
+        tuple(row[1 : len(key_columns) + 1]): (
+            row[0],
+            dict(zip(value_columns, row[len(key_columns) + 1 :])),
+        )
+        for row in session.execute(
+            select(
+                getattr(model, primary_key),
+                *(getattr(model, column) for column in key_columns),
+                *(getattr(model, column) for column in value_columns),
+            ).where(model.idUsers == idUsers)
+        )
+    }
+
+    upserts: List[Dict[str, Any]] = []
+    inserted = updated = 0
+    for key, values in rows.items():
+        current = existing.get(key)
+        if current is not None and current[1] == values:
+            continue
+
+        if current is None:
+            inserted += 1
+        else:
+            updated += 1
+        upserts.append({"idUsers": idUsers, **dict(zip(key_columns, key)), **values})
+
+    deletes = tuple(
+        identity for key, (identity, _) in existing.items() if key not in rows
+    )
+
+    for start in range(0, len(upserts), batch_size):
+        session.execute(
+            database.upsert(
+                model.__table__,
+                upserts[start : start + batch_size],
+                ("idUsers", *key_columns),
+            )
+        )
+
+    for start in range(0, len(deletes), batch_size):
+        session.execute(
+            delete(model).where(
+                getattr(model, primary_key).in_(deletes[start : start + batch_size])
+            )
+        )
+
+    return SyncCounts(
+        inserted, updated, len(deletes), len(rows) - inserted - updated
+    )
+
+
+def sync(
+    database: Database,
+    wtsettings: WTSettingsYAMLSchema,
+    idUsers: int,
+    batch_size: int = 500,
+) -> SyncReport:
+    """Synchronize the actions, schemes and profiles of ``wtsettings`` into the rows
+    owned by the user ``idUsers`` in one transaction.
+
+    :param database: The database to write to.
+    :param wtsettings: The parsed store.
+    :param idUsers: The owner of the rows.
+    :param batch_size: Maximum number of rows per statement.
+    :returns: The number of rows inserted, updated, deleted and left unchanged for each
+        table.
+    """
+
+    with database.sessionmaker() as session:
+
+        report = SyncReport(
+            sync_table(
+                database,
+                session,
+                Action,
+                ("actionSubsection", "actionKeys"),
+                idUsers,
+                rows_actions(wtsettings),
+                batch_size,
+            ),
+            sync_table(
+                database,
+                session,
+                Scheme,
+                ("schemeName",),
+                idUsers,
+                rows_schemes(wtsettings),
+                batch_size,
+            ),
+            sync_table(
+                database,
+                session,
+                Profile,
+                ("profileGuid",),
+                idUsers,
+                rows_profiles(wtsettings),
+                batch_size,
+            ),
+        )
+
+        if report.changed:
+            session.commit()
+
+    logging.info(f"Synced store for user `{idUsers}`: {report}.")
+    return report